@@ -1,5 +1,3 @@
-import tkinter as tk
-from tkinter import ttk, colorchooser, messagebox
 import irsdk
 import threading
 import time
@@ -9,25 +7,1745 @@ import yaml
 from datetime import datetime
 import urllib.request
 import json
+import argparse
+import socket
+import sys
+import urllib.parse
+import math
+import random
+import struct
+from array import array
+from collections import namedtuple
 from packaging import version
+from standings_server import DEFAULT_PORT, StandingsServer
 
 VERSION = "0.9.3"  # Easy to find and update
 
-class leagueOverlay:
+# tkinter is only imported once a window is opened, headless mode runs without it
+tk = tkfont = ttk = colorchooser = messagebox = filedialog = None
+
+def load_tk():
+    """Import tkinter for the GUI classes"""
+    global tk, tkfont, ttk, colorchooser, messagebox, filedialog
+    import tkinter as tk
+    import tkinter.font as tkfont
+    from tkinter import ttk, colorchooser, messagebox, filedialog
+
+MAX_CARS = 64  # iRacing CarIdx arrays are always 64 long
+LAP_HISTORY_LAPS = 200  # Laps kept per car before the oldest are overwritten
+LAP_HISTORY_WINDOW = 5  # Laps used for rolling average and consistency
+TIMING_LINES = 100  # Mini-sectors per lap used for interval gaps
+GAP_SMOOTHING_TIME = 1.5  # Seconds, time constant of the gap filter
+GAP_SNAP = 2.0  # Seconds, a jump this big (pit stop, incident) is taken as is
+GAP_HYSTERESIS = 0.03  # Seconds past a rounding boundary before the shown gap changes
+TREND_WINDOW = 30  # Gap samples per car the trend is fitted over
+TREND_SAMPLE_INTERVAL = 1.0  # Session seconds between trend samples
+TREND_MIN_SPAN = 8.0  # Session seconds the samples must cover before a trend is called
+TREND_THRESHOLD = 0.2  # Seconds per lap gained or lost that count as a trend
+MAX_LAPS_TO_CATCH = 99
+
+# Row diffs passed from the standings engine to the renderer
+ROW_ADDED = 'added'
+ROW_REMOVED = 'removed'
+ROW_MOVED = 'moved'
+CELL_CHANGED = 'cell'
+PLAYER_CHANGED = 'player'
+ROW_CELLS = ('position', 'division_position', 'car_number', 'driver_name', 'gap', 'points', 'trend')
+ROW_FIELDS = ROW_CELLS + ('car_idx', 'is_player', 'gap_key', 'laps_to_catch')
+# (reported field, compared slot), gaps are compared by their fixed-point key and never as text
+ROW_COMPARE = tuple((field, 'gap_key' if field == 'gap' else field) for field in ROW_FIELDS if field != 'gap_key')
+CELL_COMPARE = ROW_COMPARE[:len(ROW_CELLS)]
+RowDiff = namedtuple('RowDiff', 'kind car_idx index fields')
+
+# Per-car change sets for cars that joined or left the standings
+ROW_ADDED_CHANGE = (ROW_ADDED,)
+ROW_REMOVED_CHANGE = (ROW_REMOVED,)
+NO_ROWS = bytes(MAX_CARS)
+ROW_BUFFERS = 3  # Rows being written, the latest snapshot and one held by the GUI
+
+# Gaps are fixed-point ints, value * 4 + kind
+GAP_TENTHS = 0  # Race gap in tenths of a second
+GAP_LAPS = 1  # Whole laps behind
+GAP_MS = 2  # Best lap gap in milliseconds
+GAP_LEADER = 3
+GAP_NONE = 7  # No gap to show
+GAP_CACHE_SIZE = 4096  # Formatted gaps kept before the cache starts over
+
+# Gap trend to the division car ahead
+TREND_STEADY = 0
+TREND_CLOSING = 1
+TREND_LOSING = 2
+TREND_NAMES = ('steady', 'closing', 'losing')
+TREND_ARROWS = ('', ' \u25b2', ' \u25bc')
+
+# irsdk connection states published by ConnectionManager
+CONNECTION_DISCONNECTED = 'disconnected'
+CONNECTION_CONNECTING = 'connecting'
+CONNECTION_CONNECTED = 'connected'
+CONNECTION_STALE = 'stale'
+
+class LapHistory:
+    """Per-car lap history stored in preallocated ring buffers"""
+    def __init__(self, max_cars=MAX_CARS, capacity=LAP_HISTORY_LAPS, window=LAP_HISTORY_WINDOW):
+        self.max_cars = max_cars
+        self.capacity = capacity
+        self.window = min(window, capacity)
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded laps, e.g. when the session changes"""
+        max_cars = self.max_cars
+        capacity = self.capacity
+
+        # Flat ring buffers, car N owns slots [N * capacity, (N + 1) * capacity)
+        self.lap_numbers = array('i', [0]) * (max_cars * capacity)
+        self.lap_times = array('d', [0.0]) * (max_cars * capacity)
+        self.lap_valid = bytearray(max_cars * capacity)
+
+        # Per-car running values so every query is O(1)
+        self.lap_count = array('i', [0]) * max_cars
+        self.best_time = array('d', [0.0]) * max_cars
+        self.official_best = array('d', [0.0]) * max_cars
+        self.recorded_best = array('d', [0.0]) * max_cars
+        self.window_sum = array('d', [0.0]) * max_cars
+        self.window_sq_sum = array('d', [0.0]) * max_cars
+        self.window_valid = array('i', [0]) * max_cars
+
+        # Lap transition tracking
+        self.last_seen_lap = array('i', [-1]) * max_cars
+        self.pending_lap = array('i', [-1]) * max_cars
+        self.last_raw_time = array('d', [0.0]) * max_cars
+
+    def update(self, car_idx_lap, car_idx_last_lap_time, car_idx_best_lap_time=None):
+        """Detect CarIdxLap increments and record the completed laps"""
+        if not car_idx_lap or not car_idx_last_lap_time:
+            return
+
+        for car_idx in range(min(len(car_idx_lap), self.max_cars)):
+            lap = car_idx_lap[car_idx]
+            last_time = car_idx_last_lap_time[car_idx]
+            previous_lap = self.last_seen_lap[car_idx]
+
+            if lap != previous_lap:
+                if previous_lap >= 0 and lap == previous_lap + 1:
+                    # A lap still waiting for its time never got one
+                    if self.pending_lap[car_idx] >= 0:
+                        self.record_lap(car_idx, self.pending_lap[car_idx], -1.0)
+                    self.pending_lap[car_idx] = previous_lap
+                else:
+                    # Joined, reset or towed - nothing to record
+                    self.pending_lap[car_idx] = -1
+                    self.last_raw_time[car_idx] = last_time
+                self.last_seen_lap[car_idx] = lap
+
+            # iRacing publishes CarIdxLastLapTime shortly after the line is crossed
+            if self.pending_lap[car_idx] >= 0 and last_time != self.last_raw_time[car_idx]:
+                self.record_lap(car_idx, self.pending_lap[car_idx], last_time)
+                self.pending_lap[car_idx] = -1
+                self.last_raw_time[car_idx] = last_time
+
+            # Official best leaves out laps iRacing invalidated and may include laps
+            # from before the overlay started, recorded laps are only the fallback
+            if car_idx_best_lap_time:
+                official_best = car_idx_best_lap_time[car_idx]
+                if official_best > 0:
+                    self.official_best[car_idx] = official_best
+                    self.best_time[car_idx] = official_best
+
+    def record_lap(self, car_idx, lap_number, lap_time):
+        """Store a completed lap, negative or zero times are kept but marked invalid"""
+        count = self.lap_count[car_idx]
+        base = car_idx * self.capacity
+        slot = base + count % self.capacity
+        is_valid = lap_time > 0
+
+        # Drop the lap that falls out of the rolling window before its slot can be
+        # overwritten, which happens when the window spans the whole ring
+        if count >= self.window:
+            old_slot = base + (count - self.window) % self.capacity
+            if self.lap_valid[old_slot]:
+                old_time = self.lap_times[old_slot]
+                self.window_sum[car_idx] -= old_time
+                self.window_sq_sum[car_idx] -= old_time * old_time
+                self.window_valid[car_idx] -= 1
+
+        self.lap_numbers[slot] = lap_number
+        self.lap_times[slot] = lap_time
+        self.lap_valid[slot] = 1 if is_valid else 0
+
+        if is_valid:
+            self.window_sum[car_idx] += lap_time
+            self.window_sq_sum[car_idx] += lap_time * lap_time
+            self.window_valid[car_idx] += 1
+            if self.recorded_best[car_idx] <= 0 or lap_time < self.recorded_best[car_idx]:
+                self.recorded_best[car_idx] = lap_time
+                if self.official_best[car_idx] <= 0:
+                    self.best_time[car_idx] = lap_time
+
+        self.lap_count[car_idx] = count + 1
+
+    def last_lap(self, car_idx):
+        """Return (lap number, lap time, valid) of the most recent lap or None"""
+        count = self.lap_count[car_idx]
+        if count == 0:
+            return None
+        slot = car_idx * self.capacity + (count - 1) % self.capacity
+        return self.lap_numbers[slot], self.lap_times[slot], bool(self.lap_valid[slot])
+
+    def best_lap(self, car_idx):
+        """Official best lap time for a car, else the best recorded lap, 0 if neither"""
+        return self.best_time[car_idx]
+
+    def rolling_average(self, car_idx):
+        """Average of the valid laps in the rolling window, 0 if none"""
+        valid = self.window_valid[car_idx]
+        if valid == 0:
+            return 0.0
+        return self.window_sum[car_idx] / valid
+
+    def consistency(self, car_idx):
+        """Standard deviation of the valid laps in the rolling window, 0 if fewer than two"""
+        valid = self.window_valid[car_idx]
+        if valid < 2:
+            return 0.0
+        mean = self.window_sum[car_idx] / valid
+        variance = self.window_sq_sum[car_idx] / valid - mean * mean
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+    def laps(self, car_idx):
+        """Yield (lap number, lap time, valid) for the laps still held, oldest first"""
+        count = self.lap_count[car_idx]
+        base = car_idx * self.capacity
+        for n in range(max(0, count - self.capacity), count):
+            slot = base + n % self.capacity
+            yield self.lap_numbers[slot], self.lap_times[slot], bool(self.lap_valid[slot])
+
+class TimingLines:
+    """Session time at which each car crossed each of N mini-sector lines"""
+    def __init__(self, max_cars=MAX_CARS, lines=TIMING_LINES):
+        self.max_cars = max_cars
+        self.lines = lines
+        self.reset()
+
+    def reset(self):
+        """Forget all crossings, e.g. when the session changes"""
+        max_cars = self.max_cars
+        lines = self.lines
+
+        # Fixed cars x lines tables, slot = car_idx * lines + line
+        self.crossing_times = array('d', [0.0]) * (max_cars * lines)
+        self.crossing_ordinals = array('q', [-1]) * (max_cars * lines)
+
+        # Last sample per car, position is laps completed + lap fraction
+        self.last_position = array('d', [-1.0]) * max_cars
+        self.last_time = array('d', [-1.0]) * max_cars
+        self.last_ordinal = array('q', [-1]) * max_cars
+
+    def update(self, session_time, car_idx_lap, car_idx_lap_dist_pct):
+        """Record every line each car crossed since the previous sample"""
+        if session_time is None or not car_idx_lap or not car_idx_lap_dist_pct:
+            return
+
+        lines = self.lines
+        for car_idx in range(min(len(car_idx_lap), self.max_cars)):
+            lap = car_idx_lap[car_idx]
+            pct = car_idx_lap_dist_pct[car_idx]
+
+            # Not in world
+            if lap < 0 or pct < 0 or pct > 1:
+                self.last_time[car_idx] = -1.0
+                continue
+
+            previous_time = self.last_time[car_idx]
+            previous_position = self.last_position[car_idx]
+            position = lap + pct
+
+            if previous_time >= 0:
+                # Follow lap fraction so a late CarIdxLap increment doesn't look like a lap jump
+                delta = pct - (previous_position % 1.0)
+                if delta < -0.5:
+                    delta += 1.0
+                moved = previous_position + delta
+
+                # Towed, reset or a long gap between samples - start over from here
+                if delta < 0 or abs(moved - position) > 1.5 or session_time - previous_time > 30:
+                    previous_time = -1.0
+                else:
+                    position = moved
+
+            if previous_time >= 0 and position > previous_position:
+                first_ordinal = int(previous_position * lines) + 1
+                last_ordinal = int(position * lines)
+                elapsed = session_time - previous_time
+                travelled = position - previous_position
+                for ordinal in range(first_ordinal, last_ordinal + 1):
+                    # Interpolate the crossing time between the two samples
+                    fraction = (ordinal / lines - previous_position) / travelled
+                    slot = car_idx * lines + ordinal % lines
+                    self.crossing_times[slot] = previous_time + fraction * elapsed
+                    self.crossing_ordinals[slot] = ordinal
+                if last_ordinal >= first_ordinal:
+                    self.last_ordinal[car_idx] = last_ordinal
+
+            self.last_position[car_idx] = position
+            self.last_time[car_idx] = session_time
+
+    def gap(self, car_idx, car_ahead_idx):
+        """Seconds between two cars at their most recent common crossing, None if unknown"""
+        ordinal = min(self.last_ordinal[car_idx], self.last_ordinal[car_ahead_idx])
+        if ordinal < 0:
+            return None
+
+        slot = ordinal % self.lines
+        behind_slot = car_idx * self.lines + slot
+        ahead_slot = car_ahead_idx * self.lines + slot
+
+        # Both cars must still hold this exact crossing, i.e. be less than a lap apart
+        if self.crossing_ordinals[behind_slot] != ordinal or self.crossing_ordinals[ahead_slot] != ordinal:
+            return None
+        return self.crossing_times[behind_slot] - self.crossing_times[ahead_slot]
+
+class GapSmoother:
+    """Per-car exponential smoothing of race gaps with display hysteresis
+
+    The filter weight follows the session time between samples, so the
+    smoothing is the same at any refresh rate. The shown tenths only move once
+    the smoothed gap is past the rounding boundary by the hysteresis margin.
+    """
+    def __init__(self, max_cars=MAX_CARS, smoothing_time=GAP_SMOOTHING_TIME, snap=GAP_SNAP,
+                 hysteresis=GAP_HYSTERESIS):
+        self.max_cars = max_cars
+        self.smoothing_time = smoothing_time
+        self.snap = snap
+        self.margin = 0.5 + hysteresis * 10  # In tenths from the shown value
+        self.reset()
+
+    def reset(self):
+        """Forget every car's filter, e.g. when the session changes"""
+        max_cars = self.max_cars
+        self.smoothed = array('d', [0.0]) * max_cars
+        self.last_time = array('d', [-1.0]) * max_cars
+        self.car_ahead = array('i', [-1]) * max_cars
+        self.shown_tenths = array('q', [-1]) * max_cars
+
+    def forget(self, car_idx):
+        """Start a car over, e.g. while it is laps down"""
+        self.last_time[car_idx] = -1.0
+        self.shown_tenths[car_idx] = -1
+
+    def key(self, car_idx, car_ahead_idx, time_gap, session_time):
+        """Fixed-point key of the smoothed gap as it should be shown"""
+        last_time = self.last_time[car_idx]
+        # A different car ahead is a different interval, start from the raw gap
+        if last_time < 0 or self.car_ahead[car_idx] != car_ahead_idx or abs(time_gap - self.smoothed[car_idx]) > self.snap:
+            smoothed = time_gap
+            self.shown_tenths[car_idx] = -1
+        else:
+            elapsed = session_time - last_time
+            if elapsed <= 0:
+                smoothed = self.smoothed[car_idx]
+            else:
+                weight = 1.0 - math.exp(-elapsed / self.smoothing_time)
+                smoothed = self.smoothed[car_idx] + weight * (time_gap - self.smoothed[car_idx])
+        self.smoothed[car_idx] = smoothed
+        self.last_time[car_idx] = session_time
+        self.car_ahead[car_idx] = car_ahead_idx
+
+        tenths = smoothed * 10
+        shown = self.shown_tenths[car_idx]
+        if shown < 0 or abs(tenths - shown) >= self.margin:
+            shown = self.shown_tenths[car_idx] = round(tenths)
+        return shown * 4 + GAP_TENTHS
+
+class GapTrend:
+    """Per-car rolling window of gaps to the division car ahead, stored in ring arrays
+
+    Least-squares sums are updated as samples enter and leave the window, so
+    the slope costs O(1) per car per tick. Sample times are relative to the
+    oldest sample, the origin moves up and the sums are rebuilt once per pass
+    around the ring, which keeps them well conditioned in a long stint.
+    """
+    def __init__(self, max_cars=MAX_CARS, window=TREND_WINDOW, interval=TREND_SAMPLE_INTERVAL):
+        self.max_cars = max_cars
+        self.window = window
+        self.interval = interval
+        self.reset()
+
+    def reset(self):
+        """Forget every car's samples, e.g. when the session changes"""
+        max_cars = self.max_cars
+        window = self.window
+
+        # Flat ring buffers, car N owns slots [N * window, (N + 1) * window)
+        self.times = array('d', [0.0]) * (max_cars * window)
+        self.gaps = array('d', [0.0]) * (max_cars * window)
+
+        self.count = array('i', [0]) * max_cars  # Samples added since the window started
+        self.origin = array('d', [0.0]) * max_cars
+        self.car_ahead = array('i', [-1]) * max_cars
+        self.sum_t = array('d', [0.0]) * max_cars
+        self.sum_g = array('d', [0.0]) * max_cars
+        self.sum_tt = array('d', [0.0]) * max_cars
+        self.sum_tg = array('d', [0.0]) * max_cars
+
+    def forget(self, car_idx):
+        """Start a car's window over, e.g. while it is laps down"""
+        self.count[car_idx] = 0
+        self.car_ahead[car_idx] = -1
+        self.sum_t[car_idx] = self.sum_g[car_idx] = self.sum_tt[car_idx] = self.sum_tg[car_idx] = 0.0
+
+    def add(self, car_idx, car_ahead_idx, time_gap, session_time):
+        """Record a gap sample, at most one per interval"""
+        if self.car_ahead[car_idx] != car_ahead_idx:
+            # A different car ahead is a different interval
+            self.forget(car_idx)
+            self.car_ahead[car_idx] = car_ahead_idx
+            self.origin[car_idx] = session_time
+
+        count = self.count[car_idx]
+        base = car_idx * self.window
+        t = session_time - self.origin[car_idx]
+        if count:
+            elapsed = t - self.times[base + (count - 1) % self.window]
+            if elapsed < 0:
+                # Session time went backwards, e.g. a replay was rewound
+                self.forget(car_idx)
+                self.add(car_idx, car_ahead_idx, time_gap, session_time)
+                return
+            if elapsed < self.interval:
+                return
+
+        # Drop the sample this one overwrites from the sums
+        slot = base + count % self.window
+        if count >= self.window:
+            old_t = self.times[slot]
+            old_g = self.gaps[slot]
+            self.sum_t[car_idx] -= old_t
+            self.sum_g[car_idx] -= old_g
+            self.sum_tt[car_idx] -= old_t * old_t
+            self.sum_tg[car_idx] -= old_t * old_g
+
+        self.times[slot] = t
+        self.gaps[slot] = time_gap
+        self.sum_t[car_idx] += t
+        self.sum_g[car_idx] += time_gap
+        self.sum_tt[car_idx] += t * t
+        self.sum_tg[car_idx] += t * time_gap
+        self.count[car_idx] = count + 1
+        if (count + 1) % self.window == 0:
+            self.rebase(car_idx)
+
+    def rebase(self, car_idx):
+        """Move a full window's origin to its oldest sample and rebuild the sums without drift"""
+        base = car_idx * self.window
+        # The ring just wrapped, so the oldest sample is in the first slot
+        shift = self.times[base]
+        self.origin[car_idx] += shift
+        sum_t = sum_g = sum_tt = sum_tg = 0.0
+        for slot in range(base, base + self.window):
+            t = self.times[slot] - shift
+            g = self.gaps[slot]
+            self.times[slot] = t
+            sum_t += t
+            sum_g += g
+            sum_tt += t * t
+            sum_tg += t * g
+        self.sum_t[car_idx] = sum_t
+        self.sum_g[car_idx] = sum_g
+        self.sum_tt[car_idx] = sum_tt
+        self.sum_tg[car_idx] = sum_tg
+
+    def slope(self, car_idx):
+        """Least-squares change of the gap in seconds per second, None until the window spans enough time"""
+        count = self.count[car_idx]
+        samples = min(count, self.window)
+        if samples < 3:
+            return None
+        base = car_idx * self.window
+        span = self.times[base + (count - 1) % self.window] - self.times[base + (count - samples) % self.window]
+        if span < TREND_MIN_SPAN:
+            return None
+        sum_t = self.sum_t[car_idx]
+        denominator = samples * self.sum_tt[car_idx] - sum_t * sum_t
+        if denominator <= 0:
+            return None
+        return (samples * self.sum_tg[car_idx] - sum_t * self.sum_g[car_idx]) / denominator
+
+    def state(self, car_idx, lap_time):
+        """(trend, laps to catch the car ahead), laps to catch is -1 unless closing"""
+        slope = self.slope(car_idx)
+        if slope is None or lap_time <= 0:
+            return TREND_STEADY, -1
+        per_lap = slope * lap_time
+        if per_lap <= -TREND_THRESHOLD:
+            gap = self.gaps[car_idx * self.window + (self.count[car_idx] - 1) % self.window]
+            # A gap of about zero still takes a lap to close, never report 0 laps
+            return TREND_CLOSING, max(1, min(MAX_LAPS_TO_CATCH, math.ceil(gap / -per_lap)))
+        if per_lap >= TREND_THRESHOLD:
+            return TREND_LOSING, -1
+        return TREND_STEADY, -1
+
+class SessionStats:
+    """Session-level lap stats and driver lookups, rebuilt once per session info revision"""
+    def __init__(self, max_cars=MAX_CARS):
+        self.max_cars = max_cars
+        self.revision = None
+        self.fastest_lap_time = 90
+        self.best_laps = array('d', [90.0]) * max_cars
+        self.class_best_laps = {}
+        self.drivers_by_idx = {}
+
+    def update(self, revision, current_session, drivers):
+        """Rebuild everything if the session info revision changed, returns True if it did"""
+        if revision == self.revision:
+            return False
+        self.revision = revision
+
+        self.drivers_by_idx = {}
+        for driver in drivers or []:
+            car_idx = driver.get('CarIdx')
+            if car_idx is not None:
+                self.drivers_by_idx[car_idx] = driver
+
+        # One pass over the results instead of one per driver per tick
+        fastest_time = float('inf')
+        self.best_laps = array('d', [90.0]) * self.max_cars # default to 90 if no best lap found
+        self.class_best_laps = {}
+        try:
+            results = current_session.get('ResultsPositions') or []
+        except AttributeError:
+            results = []
+        seen = set()
+        for result in results:
+            car_idx = result.get('CarIdx')
+            best_lap = result.get('FastestTime')
+            if best_lap is None:
+                continue
+            if 0 < best_lap < fastest_time:
+                fastest_time = best_lap
+            if car_idx is None or not 0 <= car_idx < self.max_cars or car_idx in seen:
+                continue
+            seen.add(car_idx)
+            self.best_laps[car_idx] = best_lap
+
+            driver = self.drivers_by_idx.get(car_idx)
+            if driver and best_lap > 0:
+                class_id = driver.get('CarClassID')
+                if class_id not in self.class_best_laps or best_lap < self.class_best_laps[class_id]:
+                    self.class_best_laps[class_id] = best_lap
+
+        self.fastest_lap_time = fastest_time if fastest_time != float('inf') else 90
+        return True
+
+    def fastest_lap(self):
+        """Fastest lap of the session, 90 if nobody has set one"""
+        return self.fastest_lap_time
+
+    def best_lap(self, car_idx):
+        """Best lap of a car from the session results, 90 if it has none"""
+        return self.best_laps[car_idx]
+
+    def class_best_lap(self, class_id):
+        """Fastest lap within a car class, 0 if nobody in it has set one"""
+        return self.class_best_laps.get(class_id, 0)
+
+    def driver(self, car_idx):
+        """DriverInfo entry for a CarIdx or None"""
+        return self.drivers_by_idx.get(car_idx)
+
+class StandingRow:
+    """One standings row, preallocated per CarIdx and overwritten in place"""
+    __slots__ = ROW_FIELDS
+
+    def __init__(self, car_idx=0):
+        self.position = 0
+        self.division_position = 0
+        self.car_number = ''
+        self.driver_name = ''
+        self.gap = ''
+        self.points = ''
+        self.car_idx = car_idx
+        self.is_player = False
+        self.gap_key = GAP_NONE
+        self.trend = TREND_STEADY
+        self.laps_to_catch = -1
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def copy_from(self, other):
+        for field in ROW_FIELDS:
+            setattr(self, field, getattr(other, field))
+
+    def changed_fields(self, previous):
+        """Fields that differ from another row, an empty tuple when none do"""
+        for _, key in ROW_COMPARE:
+            if getattr(self, key) != getattr(previous, key):
+                return tuple(field for field, key in ROW_COMPARE if getattr(self, key) != getattr(previous, key))
+        return ()
+
+class GapFormatter:
+    """Display text for fixed-point gap keys, a key is only formatted once while it stays cached"""
+    def __init__(self, size=GAP_CACHE_SIZE):
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        self.cache = {GAP_LEADER: "Leader", GAP_NONE: ""}
+
+    @staticmethod
+    def race_key(time_gap, lap_difference):
+        """Key for a race gap, tenths of a second on the same lap"""
+        if lap_difference > 0:
+            return lap_difference * 4 + GAP_LAPS
+        return round(time_gap * 10) * 4 + GAP_TENTHS
+
+    @staticmethod
+    def best_lap_key(time_gap):
+        """Key for a best lap gap in milliseconds, may be negative"""
+        return round(time_gap * 1000) * 4 + GAP_MS
+
+    def text(self, key):
+        text = self.cache.get(key)
+        if text is None:
+            if len(self.cache) >= self.size:
+                self.reset()
+            text = self.cache[key] = self.format(key)
+        return text
+
+    @staticmethod
+    def format(key):
+        value, kind = divmod(key, 4)
+        if kind == GAP_LAPS:
+            return f"{value}L"
+        if kind == GAP_MS:
+            return f"{value / 1000:.3f}"
+        if kind == GAP_TENTHS:
+            if value < 600:
+                return f"{value // 10}.{value % 10}"
+            minutes, tenths = divmod(value, 600)
+            return f"{minutes}:{tenths // 10:02d}.{tenths % 10}"
+        return "Leader" if key == GAP_LEADER else ""
+
+class StandingsOrder:
+    """Running order kept between ticks and re-sorted with an adaptive insertion pass"""
+    def __init__(self, max_cars=MAX_CARS):
+        self.active = bytearray(max_cars)  # Per car: 0 not running, 1 running, 2 already placed
+        self.order = []
+
+    def reset(self):
+        """Forget the previous order"""
+        self.active[:] = bytes(len(self.active))
+        self.order = []
+
+    def update(self, cars, sort_keys):
+        """Re-sort the previous order for cars by sort_keys[car_idx] (lowest first), returns True if it changed"""
+        previous = self.order
+        active = self.active
+        for car_idx in previous:
+            active[car_idx] = 0
+        for car_idx in cars:
+            active[car_idx] = 1
+
+        # Cars still running keep their previous places, newcomers go to the back
+        order = []
+        for car_idx in previous:
+            if active[car_idx] == 1:
+                active[car_idx] = 2
+                order.append(car_idx)
+        if len(order) != len(cars):
+            order.extend(car_idx for car_idx in cars if active[car_idx] == 1)
+
+        # Insertion sort is near-linear when only a few cars swapped places
+        for i in range(1, len(order)):
+            car_idx = order[i]
+            key = sort_keys[car_idx]
+            j = i
+            while j > 0 and sort_keys[order[j - 1]] > key:
+                order[j] = order[j - 1]
+                j -= 1
+            order[j] = car_idx
+
+        self.order = order
+        return order != previous
+
+class PointsEngine:
+    """Championship totals per division projected from the current running order"""
+    def __init__(self):
+        self.points_table = []  # Points by division finishing position, P1 first
+        self.season_totals = {}  # Driver name -> points before this race
+        self.reset()
+
+    @property
+    def enabled(self):
+        return bool(self.points_table)
+
+    def load(self, path):
+        """Load {"points": [...], "totals": {driver name: points}}, no path disables projection"""
+        self.points_table = []
+        self.season_totals = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                self.points_table = [float(points) for points in data.get('points', [])]
+                self.season_totals = {name: float(total) for name, total in data.get('totals', {}).items()}
+            except Exception as e:
+                print(f"Points table error: {e}")
+        self.reset()
+
+    def reset(self):
+        """Forget the projections, every division is recomputed on the next tick"""
+        self.projected = {}  # Driver name -> (projected total, championship position)
+        self.labels = {}  # Driver name -> display text, built once per order change
+        self.stale = True
+
+    def finishing_points(self, division_position):
+        if division_position <= len(self.points_table):
+            return self.points_table[division_position - 1]
+        return 0
+
+    def project(self, running_order, rivals):
+        """Recompute one division from its running order (driver names), rivals are its season drivers"""
+        totals = {name: self.season_totals.get(name, 0) for name in rivals}
+        for i, name in enumerate(running_order):
+            totals[name] = self.season_totals.get(name, 0) + self.finishing_points(i + 1)
+        standings = sorted(totals, key=lambda name: (-totals[name], name))
+        for position, name in enumerate(standings, 1):
+            self.projected[name] = (totals[name], position)
+            self.labels[name] = f"P{position} {totals[name]:g}"
+
+class TelemetryReader:
+    """Telemetry read straight from the SDK memory map, variable layout parsed once per connection
+
+    Wraps an irsdk.IRSDK with the same item interface. Like irsdk, the newest
+    buffer is copied once per tick. Per-car arrays come back as memoryviews over
+    that copy, so they stay valid until the next freeze_var_buffer_latest and
+    are overwritten by it.
+    """
+    VAR_HEADER_SIZE = 144
+    VAR_BUF_OFFSET = 48  # First rotating buffer descriptor in the header
+    VAR_BUF_SIZE = 16
+    TICK = struct.Struct('i')
+    COPY_ATTEMPTS = 3  # The sim can start rewriting a buffer while it is copied
+
+    def __init__(self, ir):
+        self.ir = ir
+        self.memory = None
+        self.variables = {}  # name -> (format, offset, count)
+        self.buffer_offsets = []  # Start of each rotating buffer, fixed for the connection
+        self.frozen = None  # Copy of the newest buffer, refilled in place every tick
+        self.views = {}  # name -> (memoryview over the copy, is_scalar)
+        self.buffer = None  # Rotating buffer copied this tick
+
+    def startup(self, *args, **kwargs):
+        started = self.ir.startup(*args, **kwargs)
+        if started:
+            self.attach()
+        return started
+
+    def shutdown(self):
+        # The map can't close while memoryviews over it are still exported
+        self.detach()
+        self.ir.shutdown()
+
+    @property
+    def is_connected(self):
+        return self.ir.is_connected
+
+    @property
+    def is_initialized(self):
+        return self.ir.is_initialized
+
+    @property
+    def session_info_update(self):
+        return self.ir.session_info_update
+
+    @property
+    def var_header_buffer_tick(self):
+        """Tick count of the newest rotating buffer, irsdk.IRSDK only has this for .ibt files"""
+        if self.memory is None:
+            raise RuntimeError("telemetry map is not attached")
+        return max(self.buffer_ticks())
+
+    def attach(self):
+        """Parse the variable headers and buffer offsets once for this connection"""
+        self.detach()
+        shared_mem = self.ir._shared_mem
+        num_vars, var_header_offset, num_buf = struct.unpack_from('iii', shared_mem, 24)
+        for i in range(num_vars):
+            base = var_header_offset + i * self.VAR_HEADER_SIZE
+            var_type, offset, count = struct.unpack_from('iii', shared_mem, base)
+            name = shared_mem[base + 16:base + 48].split(b'\0', 1)[0].decode('latin-1')
+            self.variables[name] = (irsdk.VAR_TYPE_MAP[var_type], offset, count)
+        self.buffer_offsets = [
+            self.TICK.unpack_from(shared_mem, self.VAR_BUF_OFFSET + i * self.VAR_BUF_SIZE + 4)[0]
+            for i in range(num_buf)
+        ]
+        buf_len = self.TICK.unpack_from(shared_mem, 36)[0]
+        self.frozen = memoryview(bytearray(buf_len))
+        self.memory = memoryview(shared_mem)
+
+    def detach(self):
+        """Release every view over the map"""
+        for view, _ in self.views.values():
+            view.release()
+        self.views = {}
+        if self.frozen is not None:
+            self.frozen.release()
+            self.frozen = None
+        if self.memory is not None:
+            self.memory.release()
+            self.memory = None
+        self.variables = {}
+        self.buffer_offsets = []
+        self.buffer = None
+
+    def buffer_ticks(self):
+        """Tick count of each rotating buffer from its descriptor in the header"""
+        return [self.TICK.unpack_from(self.memory, self.VAR_BUF_OFFSET + i * self.VAR_BUF_SIZE)[0]
+                for i in range(len(self.buffer_offsets))]
+
+    def freeze_var_buffer_latest(self):
+        """Pin reads to one buffer until the next call, like irsdk.IRSDK"""
+        if self.memory is None:
+            return
+        frozen = self.frozen
+        for _ in range(self.COPY_ATTEMPTS):
+            ticks = self.buffer_ticks()
+            # Newest like irsdk, its tick count is only bumped once the line is complete
+            buffer = ticks.index(max(ticks))
+            start = self.buffer_offsets[buffer]
+            frozen[:] = self.memory[start:start + len(frozen)]
+            # Unchanged tick means the sim did not wrap around onto this buffer mid-copy
+            if self.buffer_ticks()[buffer] == ticks[buffer]:
+                break
+        self.buffer = buffer
+
+    def __getitem__(self, key):
+        variable = self.variables.get(key)
+        if variable is None:
+            # Session info and anything read before attach
+            return self.ir[key]
+        if self.buffer is None:
+            self.freeze_var_buffer_latest()
+
+        cached = self.views.get(key)
+        if cached is None:
+            var_format, offset, count = variable
+            view = self.frozen[offset:offset + count * struct.calcsize(var_format)].cast(var_format)
+            cached = (view, count == 1)
+            self.views[key] = cached
+        # Views read the copy, valid until the next freeze_var_buffer_latest
+        view, is_scalar = cached
+        return view[0] if is_scalar else view
+
+class ConnectionManager:
+    """irsdk connection state machine with exponential backoff between startup attempts"""
+    INITIAL_BACKOFF = 1.0
+    MAX_BACKOFF = 30.0
+    STALE_TIMEOUT = 5.0  # Seconds without a new SDK tick before the data counts as stale
+    RECONNECT_TIMEOUT = 30.0  # Stale this long and the connection is dropped and retried
+
+    def __init__(self, ir, test_file=None):
+        self.ir = ir
+        self.test_file = test_file  # SDK-layout file to read instead of the sim, see irsdk_emulator.py
+        self.state = CONNECTION_DISCONNECTED
+        self.listeners = []  # Called with the new state, from the telemetry thread
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.last_tick = None
+        self.last_tick_time = 0.0
+
+    def set_state(self, state):
+        if state != self.state:
+            self.state = state
+            for listener in self.listeners:
+                listener(state)
+
+    def backoff(self):
+        """Delay before the next startup attempt, doubling per failure with jitter"""
+        delay = min(self.MAX_BACKOFF, self.INITIAL_BACKOFF * 2 ** self.failures)
+        # Jitter keeps several overlays on one machine from probing in lockstep
+        return random.uniform(delay / 2, delay)
+
+    def wait_time(self, now):
+        """Seconds until the next startup attempt is due"""
+        return max(0.0, self.next_attempt - now)
+
+    def poll(self, now):
+        """Advance the state machine, True when there is fresh telemetry to process"""
+        if self.state in (CONNECTION_DISCONNECTED, CONNECTION_CONNECTING):
+            if now < self.next_attempt:
+                return False
+            self.set_state(CONNECTION_CONNECTING)
+            try:
+                if self.test_file:
+                    started = self.ir.startup(test_file=self.test_file)
+                else:
+                    started = self.ir.startup()
+            except Exception as e:
+                print(f"Connection error: {e}")
+                started = False
+            if not started:
+                self.failures += 1
+                self.next_attempt = now + self.backoff()
+                self.set_state(CONNECTION_DISCONNECTED)
+                return False
+            self.failures = 0
+            self.last_tick = None
+            self.last_tick_time = now
+            self.set_state(CONNECTION_CONNECTED)
+
+        if not (self.ir.is_connected and self.ir.is_initialized):
+            self.drop(now)
+            return False
+
+        # The SDK bumps the tick count on every telemetry write, a frozen count means a hung sim
+        tick = self.ir.var_header_buffer_tick
+        if tick != self.last_tick:
+            self.last_tick = tick
+            self.last_tick_time = now
+            self.set_state(CONNECTION_CONNECTED)
+            return True
+        if now - self.last_tick_time > self.RECONNECT_TIMEOUT:
+            self.drop(now)
+        elif now - self.last_tick_time > self.STALE_TIMEOUT:
+            self.set_state(CONNECTION_STALE)
+        return False
+
+    def drop(self, now):
+        """Close the SDK and retry after the initial backoff"""
+        self.ir.shutdown()
+        self.failures = 0
+        self.next_attempt = now + self.INITIAL_BACKOFF
+        self.set_state(CONNECTION_DISCONNECTED)
+
+class RefreshScheduler:
+    """Telemetry interval that follows the race: fast in close battles, slow when nothing is shown"""
+    BATTLE_GAP = 1.0  # Seconds to the division car ahead or behind that count as a battle
+    HOLD_TIME = 5.0  # Seconds to stay fast after the last battle or position change
+    MIN_INTERVAL = 0.25
+    CAUTION_INTERVAL = 4.0
+    IDLE_INTERVAL = 5.0  # In the garage or with the overlay hidden
+
+    def __init__(self):
+        self.battle_until = 0.0
+        self.busy_until = 0.0
+        self.reason = 'base'  # Why the last interval was picked, for display and debugging
+
+    def next_interval(self, now, base_interval, battle_gap=None, positions_changed=False,
+                      caution=False, in_garage=False, hidden=False):
+        """Seconds until the next telemetry read"""
+        if battle_gap is not None and battle_gap < self.BATTLE_GAP:
+            self.battle_until = now + self.HOLD_TIME
+        if positions_changed:
+            self.busy_until = now + self.HOLD_TIME
+
+        if hidden or in_garage:
+            self.reason = 'idle'
+            return max(base_interval, self.IDLE_INTERVAL)
+        if caution:
+            self.reason = 'caution'
+            return max(base_interval, self.CAUTION_INTERVAL)
+        if now < self.battle_until:
+            self.reason = 'battle'
+            return max(self.MIN_INTERVAL, base_interval / 4)
+        if now < self.busy_until:
+            self.reason = 'busy'
+            return max(self.MIN_INTERVAL, base_interval / 2)
+        self.reason = 'base'
+        return base_interval
+
+class StandingsEngine:
+    """Telemetry processing and division standings, independent of any window"""
+    def __init__(self):
+        self.ir = TelemetryReader(irsdk.IRSDK())
+        self.is_connected = False
+        self.connection = ConnectionManager(self.ir)
+        self.connection.listeners.append(self.on_connection_state)
+        self.status_listeners = []  # Called when connection state or session type changes
+        self.running = True
+        self.player_car_idx = None
+        self.session_type = None
+        self.refresh_rate = 2.0
+        self.race_data = []
+
+        # Refresh interval adapts to battles, cautions and a hidden display
+        self.adaptive_refresh = True
+        self.refresh_scheduler = RefreshScheduler()
+        self.player_battle_gap = None  # Seconds to the nearest division rival on the same lap
+        self.display_hidden = False
+
+        # Color coding data
+        self.color_config_file = "league_divisions.json"
+        self.driver_colors = {}
+
+        # Division colors
+        self.default_colors = {
+            "Pro": "#FF8C00",
+            "ProAm": "#9370DB", 
+            "Am": "#45B3E0",
+            "Rookie": "#FF2000",
+            "Default": "#FFFFFF"
+        }
+        self.available_colors = self.default_colors.copy()
+
+        # Lap history built from CarIdxLap transitions
+        self.lap_history = LapHistory()
+        self.timing_lines = TimingLines()
+        self.session_stats = SessionStats()
+        self.current_session_num = None
+
+        # Standings kept between ticks for incremental updates
+        self.standings_order = StandingsOrder()
+        self.standings_revision = 0
+        self.active_cars = []
+        self.sort_keys = array('d', [0.0]) * MAX_CARS
+        self.official_positions = array('i', [0]) * MAX_CARS
+        self.car_divisions = [None] * MAX_CARS
+
+        # Triple-buffered rows: a tick fills the back buffer while the last snapshot and the one
+        # a reader holds through acquire_standings stay intact
+        self.row_buffers = tuple([StandingRow(car_idx) for car_idx in range(MAX_CARS)] for _ in range(ROW_BUFFERS))
+        self.row_lists = tuple([] for _ in range(ROW_BUFFERS))
+        self.row_present = tuple(bytearray(MAX_CARS) for _ in range(ROW_BUFFERS))
+        self.back_buffer = 0
+        self.front_buffer = None  # Buffer of the latest snapshot, None before the first one
+        self.held_buffer = None  # Buffer a reader on another thread is still using
+        self.buffer_lock = threading.Lock()
+        self.gap_formatter = GapFormatter()
+
+        # Optional gap smoothing against CarIdxEstTime noise
+        self.smooth_gaps = False
+        self.gap_smoother = GapSmoother()
+
+        # Optional closing/losing trend to the division car ahead
+        self.track_gap_trend = False
+        self.gap_trend = GapTrend()
+        self.standings_listeners = []  # Called with each new snapshot, must not block
+        self.reset_standings()
+
+        # Optional championship projection, off until a points file is loaded
+        self.points = PointsEngine()
+        self.points_file = "league_points.json"
+        self.show_points = False
+
+        # Frames already processed are skipped when the sim has not advanced
+        self.last_frame = None
+        self.ticks_processed = 0
+        self.ticks_skipped = 0
+
+    def reset_standings(self):
+        """Forget the previous running order and division positions"""
+        self.standings_order.reset()
+        self.division_orders = {}
+        self.division_positions = array('i', [0]) * MAX_CARS
+        with self.buffer_lock:
+            published = self.front_buffer is not None
+            for buffer in range(ROW_BUFFERS):
+                # A held snapshot is left alone, its buffer is cleared before its next use
+                if buffer != self.held_buffer:
+                    self.row_lists[buffer].clear()
+                self.row_present[buffer][:] = NO_ROWS
+            self.front_buffer = None
+            # An empty snapshot of its own, so readers and listeners see the rows go away
+            if published:
+                self.standings_revision += 1
+            self.latest_standings = (self.standings_revision, [], {})
+        self.standings_changes = {}
+        self.changed_divisions = set()
+        if published:
+            for listener in self.standings_listeners:
+                listener(self.latest_standings)
+
+    def acquire_standings(self):
+        """Latest snapshot for a reader on another thread, its rows stay intact until release_standings"""
+        with self.buffer_lock:
+            self.held_buffer = self.front_buffer
+            return self.latest_standings
+
+    def release_standings(self):
+        with self.buffer_lock:
+            self.held_buffer = None
+
+    def load_color_config(self):
+        """Load division color configuration from file"""
+        if os.path.exists(self.color_config_file):
+            try:
+                with open(self.color_config_file, 'r') as f:
+                    return json.load(f)
+            except:
+                pass
+        return {}
+    
+    def get_driver_division(self, driver_name):
+        """Get division name for a driver, Default if unassigned or unknown"""
+        division_name = self.driver_colors.get(driver_name, "Default")
+        return division_name if division_name in self.available_colors else "Default"
+
+    def get_driver_color(self, driver_name):
+        """Get color for a driver based on name"""
+        # Check by driver name first
+        if driver_name in self.driver_colors:
+            division_name = self.driver_colors[driver_name]
+            return self.available_colors.get(division_name, self.available_colors["Default"])
+ 
+        return self.available_colors["Default"]
+        
+    def telemetry_loop(self):
+        """Main telemetry loop"""
+        while self.running:
+            try:
+                if self.connection.poll(time.time()):
+                    self.process_telemetry()
+                time.sleep(self.next_refresh_interval())
+                
+            except Exception as e:
+                print(f"Telemetry error: {e}")
+                time.sleep(self.connection.backoff())
+
+    def telemetry_frame(self):
+        """Identifies the SDK frame, None when the sim does not report a session tick"""
+        try:
+            session_tick = self.ir['SessionTick']
+            if session_tick is None:
+                return None
+            return (session_tick, self.ir['SessionTime'], self.ir.session_info_update)
+        except (KeyError, TypeError, AttributeError):
+            return None
+
+    def invalidate_frame(self):
+        """Process the next tick even if the sim has not advanced, after an engine input changed"""
+        self.last_frame = None
+
+    def on_connection_state(self, state):
+        """Keep is_connected in step with the connection manager and tell the listeners"""
+        self.is_connected = state in (CONNECTION_CONNECTED, CONNECTION_STALE)
+        if state == CONNECTION_CONNECTING:
+            self.last_frame = None
+        self.notify_status()
+
+    def notify_status(self):
+        for listener in self.status_listeners:
+            listener()
+                
+    def next_refresh_interval(self):
+        """Seconds until the next telemetry read, refresh_rate unless adaptive refresh is on"""
+        if self.connection.state in (CONNECTION_DISCONNECTED, CONNECTION_CONNECTING):
+            return self.connection.wait_time(time.time())
+        if not self.adaptive_refresh:
+            return self.refresh_rate
+        caution = False
+        in_garage = False
+        if self.is_connected:
+            try:
+                flags = self.ir['SessionFlags'] or 0
+                caution = bool(flags & (irsdk.Flags.caution | irsdk.Flags.caution_waving))
+                in_garage = bool(self.ir['IsInGarage'])
+            except (KeyError, TypeError):
+                pass
+        return self.refresh_scheduler.next_interval(
+            time.time(), self.refresh_rate,
+            battle_gap=self.player_battle_gap, positions_changed=bool(self.changed_divisions),
+            caution=caution, in_garage=in_garage,
+            hidden=self.display_hidden and not self.standings_listeners)  # Broadcast clients still watch
+
+    def calculate_real_time_positions(self, live_data, player_car_class_id):
+        """Active cars sorted by track position and lap count, keys go to sort_keys"""
+        car_idx_lap = live_data['CarIdxLap']
+        car_idx_lap_dist_pct = live_data['CarIdxLapDistPct']
+        car_idx_class_position = live_data['CarIdxClassPosition']
+    
+        if not car_idx_lap or not car_idx_lap_dist_pct or not car_idx_class_position:
+            return []
+    
+        # Collect all active cars, their track position goes into the per-car arrays
+        active_drivers = self.active_cars
+        active_drivers.clear()
+    
+        for car_idx in range(len(car_idx_class_position)):
+            if car_idx_class_position[car_idx] == 0:  # Not in race
+                continue
+            
+            # Find driver info
+            driver_info = self.session_stats.driver(car_idx)
+            if not driver_info:
+                continue
+            
+            # Filter by class if player is on track
+            if player_car_class_id is not None:
+                if driver_info.get('CarClassID') != player_car_class_id:
+                    continue
+        
+            # Calculate total track position (lap + percentage through current lap)
+            current_lap = car_idx_lap[car_idx]
+            lap_pct = car_idx_lap_dist_pct[car_idx]
+        
+            # Handle invalid lap percentage data
+            if lap_pct < 0 or lap_pct > 1:
+                lap_pct = 0
+            
+            total_track_position = current_lap + lap_pct
+        
+            active_drivers.append(car_idx)
+            self.sort_keys[car_idx] = -total_track_position
+            self.official_positions[car_idx] = car_idx_class_position[car_idx]
+    
+        # Sorted by process_telemetry from the previous tick's order
+        return active_drivers
+
+    def get_official_positions(self, live_data, player_car_class_id):
+        """Active cars sorted by official position for practice/qualifying sessions"""
+        car_idx_class_position = live_data['CarIdxClassPosition']
+    
+        if not car_idx_class_position:
+            return []
+    
+        active_drivers = self.active_cars
+        active_drivers.clear()
+    
+        for car_idx in range(len(car_idx_class_position)):
+            if car_idx_class_position[car_idx] == 0:  # Not in race
+                continue
+            
+            # Find driver info
+            driver_info = self.session_stats.driver(car_idx)
+            if not driver_info:
+                continue
+            
+            # Filter by class if player is on track
+            if player_car_class_id is not None:
+                if driver_info.get('CarClassID') != player_car_class_id:
+                    continue
+        
+            active_drivers.append(car_idx)
+            self.sort_keys[car_idx] = car_idx_class_position[car_idx]
+            self.official_positions[car_idx] = car_idx_class_position[car_idx]
+    
+        # Sorted by process_telemetry from the previous tick's order
+        return active_drivers
+
+    def process_telemetry(self):
+        """Process telemetry data with conditional real-time position calculations and simplified disconnect handling"""
+        try:
+            # Every read this tick comes from one copy of the newest SDK buffer, arrays
+            # read from it are overwritten by the next freeze and must not be kept
+            freeze = getattr(self.ir, 'freeze_var_buffer_latest', None)
+            if freeze:
+                freeze()
+
+            # Nothing to do if the sim has not advanced since the last processed frame
+            frame = self.telemetry_frame()
+            if frame is not None and frame == self.last_frame:
+                self.ticks_skipped += 1
+                # Nothing moved, so the refresh scheduler must not keep seeing the last frame's activity
+                self.changed_divisions.clear()
+                self.player_battle_gap = None
+                return
+            self.last_frame = frame
+            self.ticks_processed += 1
+
+            # Get driver info directly from telemetry
+            try:
+                drivers = self.ir['DriverInfo']['Drivers']
+                if not drivers:
+                    return
+            except (KeyError, TypeError) as e:
+                print(f"Error getting driver info: {e}")
+                return
+            
+            # Get session type
+            try:
+                session_num = self.ir['SessionNum']
+                session_info = self.ir['SessionInfo']
+                current_session = session_info['Sessions'][session_num]
+                session_type = current_session['SessionType']
+                is_race = session_type.lower() == 'race'
+            except (KeyError, TypeError, IndexError):
+                session_num = None
+                current_session = None
+                session_type = None
+                is_race = False
+            if session_type != self.session_type:
+                self.session_type = session_type
+                self.notify_status()
+
+            # Fastest laps and driver lookups only change with session info
+            self.session_stats.update((self.ir.session_info_update, session_num), current_session, drivers)
+
+            # Lap history and timing lines only make sense within one session
+            if session_num != self.current_session_num:
+                self.lap_history.reset()
+                self.timing_lines.reset()
+                self.gap_smoother.reset()
+                self.gap_trend.reset()
+                self.reset_standings()
+                self.current_session_num = session_num
+        
+            # Get player car index and class
+            try:
+                self.player_car_idx = self.ir['PlayerCarIdx']
+            except (KeyError, TypeError):
+                self.player_car_idx = None
+
+            player_car_class_id = None
+            if self.player_car_idx is not None:
+                player_info = self.session_stats.driver(self.player_car_idx)
+                if player_info:
+                    player_car_class_id = player_info.get('CarClassID')
+        
+            # Get live telemetry
+            live_data = self.ir
+            if not live_data:
+                return
+
+            self.lap_history.update(live_data['CarIdxLap'], live_data['CarIdxLastLapTime'],
+                                    live_data['CarIdxBestLapTime'])
+            self.timing_lines.update(live_data['SessionTime'], live_data['CarIdxLap'],
+                                     live_data['CarIdxLapDistPct'])
+        
+            # Use different methods based on session type
+            if is_race:
+                # Use real-time positions for races
+                active_drivers = self.calculate_real_time_positions(live_data, player_car_class_id)
+            else:
+                # Use official positions for practice/qualifying
+                active_drivers = self.get_official_positions(live_data, player_car_class_id)
+        
+            if not active_drivers:
+                return
+            
+            # Get timing data for gap calculations (always use official method)
+            car_idx_lap = live_data['CarIdxLap']
+            car_idx_est_time = live_data['CarIdxEstTime']
+            car_idx_lap_dist_pct = live_data['CarIdxLapDistPct']
+            session_time = live_data['SessionTime']
+            smooth_gaps = self.smooth_gaps and session_time is not None
+            track_trend = self.track_gap_trend and session_time is not None
+
+            # Re-sort from last tick's order, which is nearly sorted in a long race
+            self.standings_order.update(active_drivers, self.sort_keys)
+            driver = self.session_stats.driver
+
+            # Split the running order into divisions (divisions are keyed by color)
+            division_orders = {}
+            driver_divisions = self.car_divisions
+            for car_idx in self.standings_order.order:
+                driver_color = self.get_driver_color(driver(car_idx).get('UserName', ''))
+                driver_divisions[car_idx] = driver_color
+                division_orders.setdefault(driver_color, []).append(car_idx)
+
+            # Division positions only need recomputing where the division order changed
+            changed_divisions = set()
+            for color, division_order in division_orders.items():
+                if self.division_orders.get(color) != division_order:
+                    changed_divisions.add(color)
+                    for i, car_idx in enumerate(division_order):
+                        self.division_positions[car_idx] = i + 1
+            changed_divisions.update(color for color in self.division_orders if color not in division_orders)
+            self.division_orders = division_orders
+
+            # Championship projection follows the same changed divisions
+            project_points = is_race and self.points.enabled
+            if project_points:
+                self.project_points(division_orders, changed_divisions)
+            points_labels = self.points.labels
+        
+            # Process race standings into the back buffer's preallocated rows
+            rows = self.row_buffers[self.back_buffer]
+            # Only used to reuse gap text, which always matches its row's gap_key
+            previous_rows = self.row_buffers[self.back_buffer if self.front_buffer is None else self.front_buffer]
+            race_data = self.row_lists[self.back_buffer]
+            race_data.clear()
+            self.player_battle_gap = None
+        
+            for i, car_idx in enumerate(self.standings_order.order):
+                driver_info = driver(car_idx)
+                driver_name = driver_info.get('UserName', '')
+            
+                # Use the appropriate position for display
+                position = i + 1 if is_race else self.official_positions[car_idx]
+            
+                # Get current driver's division position
+                current_color_position = self.division_positions[car_idx]
+
+                # Calculate gap as a fixed-point key - check for disconnected drivers
+                trend = TREND_STEADY
+                laps_to_catch = -1
+                if current_color_position == 1:
+                    gap_key = GAP_LEADER
+                else:
+                    # Car ahead in the division
+                    car_ahead_idx = division_orders[driver_divisions[car_idx]][current_color_position - 2]
+                    if is_race:
+                        time_gap, lap_difference = self.race_gap_time(car_idx, car_ahead_idx, car_idx_lap,
+                                                                      car_idx_est_time, car_idx_lap_dist_pct)
+                        if smooth_gaps and lap_difference == 0:
+                            gap_key = self.gap_smoother.key(car_idx, car_ahead_idx, time_gap, session_time)
+                        else:
+                            gap_key = GapFormatter.race_key(time_gap, lap_difference)
+                            if smooth_gaps:
+                                self.gap_smoother.forget(car_idx)
+                        if track_trend:
+                            if lap_difference == 0:
+                                self.gap_trend.add(car_idx, car_ahead_idx, time_gap, session_time)
+                                trend, laps_to_catch = self.gap_trend.state(car_idx, self.get_best_lap(car_idx))
+                            else:
+                                self.gap_trend.forget(car_idx)
+                        # Closest division rival on the same lap, ahead or behind the player
+                        if lap_difference == 0 and self.player_car_idx in (car_idx, car_ahead_idx):
+                            if self.player_battle_gap is None or time_gap < self.player_battle_gap:
+                                self.player_battle_gap = time_gap
+                    else:  # Practice or Qualifying
+                        gap_key = self.best_lap_gap_key(car_idx, car_ahead_idx)
+
+                # An unchanged gap keeps last tick's text, no string work at all
+                previous = previous_rows[car_idx]
+                if gap_key == previous.gap_key:
+                    gap = previous.gap
+                else:
+                    gap = self.gap_formatter.text(gap_key)
+            
+                row = rows[car_idx]
+                row.position = position
+                row.division_position = current_color_position
+                row.car_number = driver_info.get('CarNumber', '')
+                row.driver_name = driver_name
+                row.gap = gap
+                row.gap_key = gap_key
+                row.trend = trend
+                row.laps_to_catch = laps_to_catch
+                row.points = points_labels.get(driver_name, '') if project_points else ''
+                row.is_player = (car_idx == self.player_car_idx)  # Mark if this is the player
+                race_data.append(row)
+
+            self.publish_standings(race_data, changed_divisions)
+    
+        except Exception as e:
+            print(f"Processing error: {e}")
+
+    def project_points(self, division_orders, changed_divisions):
+        """Re-project the championship of each division whose running order changed"""
+        if self.points.stale:
+            self.points.stale = False
+            changed_divisions = division_orders
+        for color in changed_divisions:
+            division_order = division_orders.get(color)
+            if not division_order:
+                continue
+            running_order = [self.session_stats.driver(car_idx).get('UserName', '') for car_idx in division_order]
+            rivals = [name for name in self.points.season_totals if self.get_driver_color(name) == color]
+            self.points.project(running_order, rivals)
+
+    def race_gap_time(self, car_idx, car_ahead_idx, car_idx_lap, car_idx_est_time, car_idx_lap_dist_pct):
+        """Seconds and whole laps to the car ahead in the division, seconds are only meaningful at 0 laps"""
+        # Both cars connected, calculate gap normally
+        current_est_time = car_idx_est_time[car_idx]
+        ahead_est_time = car_idx_est_time[car_ahead_idx]
+        current_lap = car_idx_lap[car_idx]
+        ahead_lap = car_idx_lap[car_ahead_idx]
+
+        time_gap = 0.0
+        line_gap = None
+        if current_est_time > 0 and ahead_est_time > 0:
+            time_gap = ahead_est_time - current_est_time
+        else:
+            # Time difference at the last timing line both cars crossed
+            line_gap = self.timing_lines.gap(car_idx, car_ahead_idx)
+            if line_gap is not None:
+                time_gap = line_gap
+            else:
+                # Fallback to distance calculation
+                time_gap = (car_idx_lap_dist_pct[car_ahead_idx] - car_idx_lap_dist_pct[car_idx]) * self.session_stats.fastest_lap()
+
+        # Adjust for lap differences
+        lap_difference = ahead_lap - current_lap
+        
+        # A timing line gap is only found when less than a lap apart
+        if line_gap is not None:
+            lap_difference = 0
+        # If less than 1 FULL lap down
+        elif lap_difference == 1 and car_idx_lap_dist_pct[car_ahead_idx] < car_idx_lap_dist_pct[car_idx]:
+            time_gap += self.session_stats.fastest_lap()
+            lap_difference = 0
+
+        if time_gap < 0:
+            time_gap *= -1 # just make it positive for now
+        return time_gap, max(lap_difference, 0)
+
+    def best_lap_gap_key(self, car_idx, car_ahead_idx):
+        """Fixed-point best lap gap, GAP_NONE until both cars have a lap"""
+        current_best = self.get_best_lap(car_idx)
+        ahead_best = self.get_best_lap(car_ahead_idx)
+        if current_best > 0 and ahead_best > 0:
+            return GapFormatter.best_lap_key(current_best - ahead_best)
+        return GAP_NONE
+
+    def publish_standings(self, race_data, changed_divisions):
+        """Swap in the back buffer as the new snapshot and record what changed per car
+
+        Listeners get the rows while they are current and copy what they keep.
+        Readers on another thread use acquire_standings, any other snapshot's
+        rows are reused by a later tick.
+        """
+        back = self.back_buffer
+        front = self.front_buffer
+        present = self.row_present[back]
+        if front is None:
+            previous_present, previous_rows, previous_list = NO_ROWS, None, ()
+        else:
+            previous_present = self.row_present[front]
+            previous_rows = self.row_buffers[front]
+            previous_list = self.row_lists[front]
+        present[:] = NO_ROWS
+        changes = {}
+        for row in race_data:
+            car_idx = row.car_idx
+            present[car_idx] = 1
+            if not previous_present[car_idx]:
+                changes[car_idx] = ROW_ADDED_CHANGE
+            else:
+                changed_fields = row.changed_fields(previous_rows[car_idx])
+                if changed_fields:
+                    changes[car_idx] = changed_fields
+        for row in previous_list:
+            if not present[row.car_idx]:
+                changes[row.car_idx] = ROW_REMOVED_CHANGE
+
+        self.standings_changes = changes
+        self.changed_divisions = changed_divisions
+        self.standings_revision += 1
+        self.race_data = race_data
+        with self.buffer_lock:
+            # Read as one tuple so revision, rows and changes always belong together
+            self.latest_standings = (self.standings_revision, race_data, changes)
+            self.front_buffer = back
+            # Next tick writes to the buffer that is neither this snapshot nor a held one
+            self.back_buffer = next(buffer for buffer in range(ROW_BUFFERS)
+                                    if buffer != back and buffer != self.held_buffer)
+        for listener in self.standings_listeners:
+            listener(self.latest_standings)
+
+    def diff_rows(self, previous, current, changes=None):
+        """Typed row diffs turning the previous row list into the current one
+
+        changes is the engine's per-car change set, when both lists come from
+        consecutive snapshots only the cars in it can have changed cells.
+        """
+        previous_rows = {}
+        for i, row in enumerate(previous):
+            previous_rows[row['car_idx']] = (i, row)
+
+        diffs = []
+        current_cars = set()
+        for i, row in enumerate(current):
+            car_idx = row['car_idx']
+            current_cars.add(car_idx)
+            old = previous_rows.get(car_idx)
+            if old is None:
+                diffs.append(RowDiff(ROW_ADDED, car_idx, i, None))
+                continue
+
+            old_index, old_row = old
+            if old_index != i:
+                diffs.append(RowDiff(ROW_MOVED, car_idx, i, None))
+            if changes is not None and car_idx not in changes:
+                continue
+            fields = tuple(field for field, key in CELL_COMPARE if old_row[key] != row[key])
+            if fields:
+                diffs.append(RowDiff(CELL_CHANGED, car_idx, i, fields))
+            if old_row['is_player'] != row['is_player']:
+                diffs.append(RowDiff(PLAYER_CHANGED, car_idx, i, None))
+
+        for car_idx, (old_index, old_row) in previous_rows.items():
+            if car_idx not in current_cars:
+                diffs.append(RowDiff(ROW_REMOVED, car_idx, old_index, None))
+        return diffs
+
+    def get_best_lap(self, car_idx):
+        """Best lap from lap history, falling back to session info for cars without one"""
+        best_lap = self.lap_history.best_lap(car_idx)
+        if best_lap > 0:
+            return best_lap
+        return self.session_stats.best_lap(car_idx)
+            
+class StyleRegistry:
+    """Shared fonts and named row styles that every driver row references"""
+    ROW_BG = 'black'
+    PLAYER_BG = '#1a1a1a'
+    GAP_FG = 'white'
+    CLOSING_FG = '#32CD32'
+    LOSING_FG = '#FF5050'
+
+    def __init__(self, root, division_colors, bold_rows=False):
+        self.style = ttk.Style(root)
+        self.normal_font = tkfont.Font(root=root, family='Arial', size=9, weight='normal')
+        self.bold_font = tkfont.Font(root=root, family='Arial', size=9, weight='bold')
+        # Font used by non-player rows, follows the bold_drivers setting
+        self.row_font = tkfont.Font(root=root, family='Arial', size=9,
+                                    weight='bold' if bold_rows else 'normal')
+        self.division_colors = {}
+        self.configure_style('Gap', self.GAP_FG)
+        self.configure_style('Closing', self.CLOSING_FG)
+        self.configure_style('Losing', self.LOSING_FG)
+        self.set_division_colors(division_colors)
+
+    def style_name(self, name, is_player):
+        """ttk style name for a division (or 'Gap') row cell"""
+        kind = 'Player' if is_player else 'Row'
+        return f"{str(name).replace('.', '_')}.{kind}.TLabel"
+
+    def configure_style(self, name, color):
+        """Configure the row and player styles for one name"""
+        self.style.configure(self.style_name(name, False), foreground=color, background=self.ROW_BG,
+                             font=self.row_font, padding=1)
+        self.style.configure(self.style_name(name, True), foreground=color, background=self.PLAYER_BG,
+                             font=self.bold_font, padding=1)
+
+    def set_division_colors(self, division_colors):
+        """Update division styles, only divisions whose color changed are touched"""
+        for division, color in division_colors.items():
+            if self.division_colors.get(division) != color:
+                self.configure_style(division, color)
+        self.division_colors = dict(division_colors)
+
+    def set_bold_rows(self, bold_rows):
+        """Switch every non-player row between normal and bold with one font change"""
+        weight = 'bold' if bold_rows else 'normal'
+        if self.row_font.cget('weight') != weight:
+            self.row_font.configure(weight=weight)
+
+    def division_style(self, division, is_player):
+        """Style for the colored cells of a row"""
+        if division not in self.division_colors:
+            division = "Default"
+        return self.style_name(division, is_player)
+
+    def gap_style(self, is_player, trend=TREND_STEADY):
+        """Style for the gap cell of a row, colored when closing or losing"""
+        if trend == TREND_CLOSING:
+            return self.style_name('Closing', is_player)
+        if trend == TREND_LOSING:
+            return self.style_name('Losing', is_player)
+        return self.style_name('Gap', is_player)
+
+    def row_background(self, is_player):
+        """Background of the row frame"""
+        return self.PLAYER_BG if is_player else self.ROW_BG
+
+class AutoCenter:
+    """Keeps the player's row inside a center band using fixed row heights"""
+    def __init__(self, row_pitch, band=0.4, smooth=False):
+        self.row_pitch = row_pitch  # Pixels from the top of one row to the next
+        self.band = band  # Fraction of the view height the player row may drift in
+        self.smooth = smooth
+        self.view_height = 0
+        self.top = 0.0  # Current scroll offset in pixels
+        self.target = None
+        self.last_index = None
+        self.last_rows = None
+
+    def sync(self, top):
+        """Take over a scroll offset set elsewhere, e.g. by manual scrolling"""
+        self.top = top
+        self.target = None
+        self.last_index = None
+
+    def update(self, player_index, row_count):
+        """Return the new scroll offset in pixels, or None if no scroll is needed"""
+        if self.target is None:
+            # Nothing moved, nothing to do
+            if player_index == self.last_index and row_count == self.last_rows:
+                return None
+            self.last_index = player_index
+            self.last_rows = row_count
+
+            content_height = row_count * self.row_pitch
+            if content_height <= self.view_height:
+                target = 0.0
+            else:
+                row_center = player_index * self.row_pitch + self.row_pitch / 2
+                view_center = self.top + self.view_height / 2
+                if abs(row_center - view_center) <= self.view_height * self.band / 2:
+                    return None
+                target = row_center - self.view_height / 2
+                target = max(0.0, min(content_height - self.view_height, target))
+            if target == self.top:
+                return None
+            self.target = target
+
+        if self.smooth:
+            # Ease out, covering a third of the remaining distance each frame
+            step = (self.target - self.top) / 3
+            if abs(step) < 0.5:
+                self.top = self.target
+            else:
+                self.top += step
+        else:
+            self.top = self.target
+        if self.top == self.target:
+            self.target = None
+        return self.top
+
+    def animating(self):
+        """True while an eased scroll still has frames to go"""
+        return self.target is not None
+
+class ColumnLayout:
+    """Column geometry shared by the header and every driver row
+
+    Columns are placed with relative coordinates, so a width change is a
+    single geometry pass in Tk instead of a per-row grid reconfiguration."""
+    COLUMNS = (('pos', 0.11), ('div_pos', 0.11), ('car_num', 0.13), ('driver', 0.46), ('gap', 0.19))
+    POINTS_COLUMN = ('points', 0.19)
+    HEADERS = {'pos': "Pos", 'div_pos': "D-Pos", 'car_num': "Car#", 'driver': "Driver", 'gap': "Div Gap",
+               'points': "Champ"}
+    CELL_PADX = 2
+
+    def __init__(self, show_points=False):
+        self.columns = self.COLUMNS + (self.POINTS_COLUMN,) if show_points else self.COLUMNS
+        total = sum(share for _, share in self.columns)
+        self.geometry = {}
+        start = 0.0
+        for key, share in self.columns:
+            self.geometry[key] = (start, share / total)
+            start += share / total
+        self.placements = {}
+
+    def placement(self, key, left=0, right=0):
+        """place() options for a column in a parent inset by left/right pixels"""
+        cache_key = (key, left, right)
+        options = self.placements.get(cache_key)
+        if options is None:
+            relx, relwidth = self.geometry[key]
+            inset = left + right
+            options = {
+                'relx': relx, 'x': round(left - relx * inset) + self.CELL_PADX,
+                'relwidth': relwidth, 'width': -round(relwidth * inset) - 2 * self.CELL_PADX,
+                'rely': 0.5, 'anchor': 'w',
+            }
+            self.placements[cache_key] = options
+        return options
+
+    def place(self, widget, key, left=0, right=0):
+        widget.place(**self.placement(key, left, right))
+
+class leagueOverlay(StandingsEngine):
     def __init__(self):
+        load_tk()
         self.root = tk.Tk()
-        self.ir = irsdk.IRSDK()
-        self.is_connected = False
-        self.running = True
+        super().__init__()
         self.drag_data = {"x": 0, "y": 0}
         
         # Auto-centering variables
-        self.player_car_idx = None
         self.last_manual_scroll = 0
         self.manual_scroll_timeout = 5  # seconds
         self.auto_center_enabled = True
         self.status_hide_timer = None
-        self.refresh_rate = 2.0
 
         self.show_only_my_division = False
         self.opacity = 1.0
@@ -45,43 +1763,57 @@ class leagueOverlay:
         self.division_cycle_order = ["Pro", "ProAm", "Am", "Rookie","All"]  # Order to cycle through
         self.update_check_done = False
         self.latest_version = None
+        self.trend_arrows = False
+        self.trend_colors = False
+        self.broadcast_enabled = False
+        self.broadcast_host = '127.0.0.1'
+        self.broadcast_port = DEFAULT_PORT
+        self.standings_server = None
 
         # Color coding data
-        self.color_config_file = "league_divisions.json"
         self.settings_file = "LeagueOverlay.config"
         self.driver_colors = self.load_color_config()
         self.load_settings()
-        
-        # Division colors
-        self.default_colors = {
-            "Pro": "#FF8C00",
-            "ProAm": "#9370DB", 
-            "Am": "#45B3E0",
-            "Rookie": "#FF2000",
-            "Default": "#FFFFFF"
-        }
         self.available_colors = self.load_division_colors()
+        self.track_gap_trend = self.trend_arrows or self.trend_colors
+        if self.show_points:
+            self.points.load(self.points_file)
 
         self.startup_time = time.time()
+        self.max_fps = 10  # Render loop frame cap
+        self.dirty = {'header': True, 'status': True, 'rows': True, 'scroll': False}
+        self.smooth_scroll = False  # Ease auto-centering over a few frames
+        self.debug_resize = False  # Print resize latency after each drag
+        self.auto_center_resumed = True
+        self.load_render_settings()
+
+        # Row state exists before the window, setup_window already lays the rows out
+        self.displayed_data = []  # Track what's currently displayed
+        self.displayed_rows = [StandingRow(car_idx) for car_idx in range(MAX_CARS)]  # Copies the rows on screen
+        self.displayed_revision = -1
+        self.displayed_view = None
+        self.data_widgets = {}    # Store widget references
+        self.context_menu = None
+
         self.setup_gui()
         self.setup_drag_functionality()
         self.setup_scroll_functionality()
         self.setup_window()
         
+        # Connection and session changes are pushed from the telemetry thread
+        self.status_listeners.append(lambda: self.mark_dirty('status'))
+        
         # Start telemetry thread
         self.telemetry_thread = threading.Thread(target=self.telemetry_loop, daemon=True)
         self.telemetry_thread.start()
         
-        # Start GUI update thread
-        self.gui_thread = threading.Thread(target=self.update_gui, daemon=True)
-        self.gui_thread.start()
-
-        self.show_version_on_startup()
+        if self.broadcast_enabled:
+            self.set_broadcast(True)
         
-        self.race_data = []
-        self.displayed_data = []  # Track what's currently displayed
-        self.data_widgets = {}    # Store widget references
-        self.context_menu = None
+        self.show_version_on_startup()
+
+        # Start the render loop on the Tk thread
+        self.root.after(0, self.render_frame)
         
     def setup_window(self):
         """Configure the main window"""
@@ -98,6 +1830,10 @@ class leagueOverlay:
         
         # Add custom resize functionality
         self.setup_custom_resize()
+        
+        # Telemetry slows down while the overlay is minimized or withdrawn
+        self.root.bind("<Unmap>", lambda e: self.set_display_hidden(e.widget, True))
+        self.root.bind("<Map>", lambda e: self.set_display_hidden(e.widget, False))
         self.refresh_layout()
 
     def show_version_on_startup(self):
@@ -112,6 +1848,11 @@ class leagueOverlay:
         self.resize_border = 10  # Pixel width of resize area
         self.resizing = False
         self.resize_direction = None
+        self.resize_settle_ms = 250  # Reflow rows once the drag has been still this long
+        self.pending_geometry = None  # (geometry, event time) waiting for the next idle
+        self.reflow_deferred = False  # Rows keep their width while a drag is in progress
+        self.reflow_job = None
+        self.resize_latencies = []
         
         # Bind to root and all main frames
         widgets_to_bind = [self.root, self.main_frame, self.canvas_frame, self.canvas]
@@ -185,6 +1926,7 @@ class leagueOverlay:
             self.resize_start_height = self.root.winfo_height()
             self.resize_start_window_x = self.root.winfo_x()
             self.resize_start_window_y = self.root.winfo_y()
+            self.resize_size = (self.resize_start_width, self.resize_start_height)
         else:
             # Only allow dragging from title bar
             if hasattr(event.widget, 'master') and event.widget.master == self.title_bar:
@@ -222,8 +1964,39 @@ class leagueOverlay:
             new_height = max(220, self.resize_start_height - dy)
             new_y = self.resize_start_window_y + dy
         
-        # Apply new size and position
-        self.root.geometry(f"{new_width}x{new_height}+{new_x}+{new_y}")
+        # Coalesce motion events, only the newest geometry is applied on the next idle
+        if self.pending_geometry is None:
+            self.root.after_idle(self.apply_pending_geometry)
+        self.pending_geometry = (new_width, new_height, f"{new_width}x{new_height}+{new_x}+{new_y}",
+                                 time.perf_counter())
+        self.reflow_deferred = True
+        
+        # Reflow rows once the drag settles, even if the button is still held
+        if self.reflow_job is not None:
+            self.root.after_cancel(self.reflow_job)
+        self.reflow_job = self.root.after(self.resize_settle_ms, self.reflow_after_resize)
+
+    def apply_pending_geometry(self):
+        """Apply the newest resize geometry, timing how long it takes to reach the screen when debugging"""
+        if self.pending_geometry is None:
+            return
+        width, height, geometry, event_time = self.pending_geometry
+        self.pending_geometry = None
+        self.root.geometry(geometry)
+        self.resize_size = (width, height)
+        if self.debug_resize:
+            # Redraws run as idle handlers, this one runs after the ones the geometry change queued
+            self.root.after_idle(lambda: self.resize_latencies.append(time.perf_counter() - event_time))
+
+    def reflow_after_resize(self):
+        """Stretch the rows to the new width, once per drag pause"""
+        self.reflow_job = None
+        self.apply_pending_geometry()
+        self.reflow_deferred = False
+        canvas_width = self.canvas.winfo_width()
+        if canvas_width > 1:
+            self.canvas.itemconfig(self.canvas.find_all()[0], width=canvas_width)
+        self.refresh_layout()
 
     def stop_resize(self, event):
         """Stop resizing"""
@@ -231,17 +2004,33 @@ class leagueOverlay:
             self.resizing = False
             self.resize_direction = None
             self.root.configure(cursor="")
-            # Update stored dimensions
-            self.width = self.root.winfo_width()
-            self.height = self.root.winfo_height()
+            # One reflow for the whole drag, unless it already ran while the drag paused
+            if self.reflow_job is not None:
+                self.root.after_cancel(self.reflow_job)
+                self.reflow_after_resize()
+            # Update stored dimensions, the window may not have processed the new geometry yet
+            self.width, self.height = self.resize_size
             self.save_settings()
-            self.root.after(100, self.refresh_layout)  # Small delay to avoid excessive calls
+            
+            if self.debug_resize and self.resize_latencies:
+                latencies = self.resize_latencies
+                print(f"Resize latency: avg {sum(latencies) / len(latencies) * 1000:.1f} ms, "
+                      f"max {max(latencies) * 1000:.1f} ms over {len(latencies)} updates")
+                self.resize_latencies = []
             
             # Save position after resize (existing functionality)
             self.root.after(1000, self.save_settings)
         
     def setup_gui(self):
         """Setup the GUI elements"""
+        # Fonts and row styles shared by every driver row
+        self.styles = StyleRegistry(self.root, self.available_colors, self.bold_drivers)
+        # Fixed row height fits either font, so row positions follow from the index
+        self.row_height = max(self.styles.normal_font.metrics('linespace'),
+                              self.styles.bold_font.metrics('linespace')) + 4
+        self.auto_center = AutoCenter(self.row_height + 2, smooth=self.smooth_scroll)  # rows pack with pady=1
+        self.columns = ColumnLayout(self.show_points and self.points.enabled)
+
         # Main frame
         self.main_frame = tk.Frame(self.root, bg='black')
         self.main_frame.pack(fill=tk.BOTH, expand=True)
@@ -279,7 +2068,7 @@ class leagueOverlay:
         self.status_label.pack(pady=5)
         
         # Fixed header frame
-        self.header_frame = tk.Frame(self.main_frame, bg='#333333')
+        self.header_frame = tk.Frame(self.main_frame, bg='#333333', height=self.row_height)
         self.header_frame.pack(fill=tk.X, pady=2)
         
         # Scrollable frame for race data
@@ -303,8 +2092,14 @@ class leagueOverlay:
         def configure_scroll_region(event=None):
             self.canvas.configure(scrollregion=self.canvas.bbox("all"))
             canvas_width = self.canvas.winfo_width()
-            if canvas_width > 1: # Ensure canvas is initialized
+            # Ensure canvas is initialized, rows are stretched after a resize drag settles
+            if canvas_width > 1 and not self.reflow_deferred:
                 self.canvas.itemconfig(self.canvas.find_all()[0], width=canvas_width)
+            view_height = self.canvas.winfo_height()
+            if view_height != self.auto_center.view_height:
+                self.auto_center.view_height = view_height
+                self.auto_center.sync(self.auto_center.top)
+                self.dirty['scroll'] = True
         
         self.scrollable_frame.bind('<Configure>', configure_scroll_region)
         self.canvas.bind('<Configure>', configure_scroll_region)
@@ -331,34 +2126,38 @@ class leagueOverlay:
                 self.root.unbind("<FocusOut>")
         
     def create_headers(self):
-        """Create column headers in the fixed header frame using grid"""
+        """Create column headers in the fixed header frame, lined up with the row columns"""
         # Clear existing headers
         for widget in self.header_frame.winfo_children():
             widget.destroy()
         
-        # Get dynamic sizes
-        sizes = self.get_dynamic_column_sizes(is_header=True)
-
-        # Configure grid with dynamic sizes and uniform groups
-        self.header_frame.grid_columnconfigure(0, weight=sizes['pos'], minsize=sizes['pos'], uniform="col0")
-        self.header_frame.grid_columnconfigure(1, weight=sizes['div_pos'], minsize=sizes['div_pos'], uniform="col1")
-        self.header_frame.grid_columnconfigure(2, weight=sizes['car_num'], minsize=sizes['car_num'], uniform="col2")
-        self.header_frame.grid_columnconfigure(3, weight=sizes['driver'], minsize=sizes['driver'], uniform="col3")
-        self.header_frame.grid_columnconfigure(4, weight=sizes['gap'], minsize=sizes['gap'], uniform="col4")
-        
-        headers = ["Pos", "D-Pos", "Car#", "Driver", "Div Gap"]
-        
-        for i, header in enumerate(headers):
-            label = tk.Label(self.header_frame, text=header, fg='white', bg='#333333',
-                            font=('Arial', 9, 'bold'))
-            label.grid(row=0, column=i, sticky='ew', padx=2)
+        # Rows sit inside the canvas padding, the header also spans the scrollbar
+        right = 5 + int(self.scrollbar.cget('width'))
+        for key, _ in self.columns.columns:
+            label = tk.Label(self.header_frame, text=ColumnLayout.HEADERS[key], fg='white', bg='#333333',
+                            font=self.styles.bold_font)
+            self.columns.place(label, key, left=5, right=right)
 
     def toggle_division_filter(self):
         """Cycle through division filters or toggle My Division if player is on track"""
-        # Check if player is on track
-        player_on_track = self.player_car_idx is not None and any(
-            d['car_idx'] == self.player_car_idx for d in self.race_data
-        )
+        # Rows of the latest snapshot, held so the telemetry thread can't reuse them meanwhile
+        _, race_data, _ = self.acquire_standings()
+        try:
+            # Check if player is on track
+            player_on_track = self.player_car_idx is not None and any(
+                d['car_idx'] == self.player_car_idx for d in race_data
+            )
+
+            # Get divisions that have drivers (excluding "All" and "Default")
+            divisions_with_drivers = set()
+            if not player_on_track:
+                for driver_data in race_data:
+                    driver_color = self.get_driver_color(driver_data['driver_name'])
+                    for div_name, div_color in self.available_colors.items():
+                        if div_color == driver_color and div_name not in ["Default", "All"]:
+                            divisions_with_drivers.add(div_name)
+        finally:
+            self.release_standings()
         
         if player_on_track:
             # Original behavior - toggle My Division
@@ -370,14 +2169,6 @@ class leagueOverlay:
             # Cycle through divisions
             self.show_only_my_division = False
             
-            # Get divisions that have drivers (excluding "All" and "Default")
-            divisions_with_drivers = set()
-            for driver_data in self.race_data:
-                driver_color = self.get_driver_color(driver_data['driver_name'])
-                for div_name, div_color in self.available_colors.items():
-                    if div_color == driver_color and div_name not in ["Default", "All"]:
-                        divisions_with_drivers.add(div_name)
-            
             # Always include "All" as an option
             available_options = [div for div in self.division_cycle_order 
                             if div == "All" or div in divisions_with_drivers]
@@ -414,6 +2205,8 @@ class leagueOverlay:
         
         self.division_filter_btn.config(text=button_text, bg=button_color)
         self.canvas.yview_moveto(0.0) # make sure to scroll to top when changing views
+        self.auto_center.sync(0.0)
+        self.mark_dirty('rows')
     
     def setup_drag_functionality(self):
         """Setup window dragging"""
@@ -438,6 +2231,7 @@ class leagueOverlay:
         """Handle mouse wheel scrolling"""
         # Mark as manual scroll
         self.last_manual_scroll = time.time()
+        self.auto_center_resumed = False
         
         # Determine scroll direction and amount
         if event.delta:  # Windows
@@ -457,6 +2251,7 @@ class leagueOverlay:
         """Handle scrollbar scrolling"""
         # Mark as manual scroll to prevent auto-centering
         self.last_manual_scroll = time.time()
+        self.auto_center_resumed = False
         # Let the scrollbar do its normal scrolling
         self.canvas.yview(*args)
 
@@ -518,16 +2313,6 @@ class leagueOverlay:
         self.running = False
         self.root.destroy()
         
-    def load_color_config(self):
-        """Load division color configuration from file"""
-        if os.path.exists(self.color_config_file):
-            try:
-                with open(self.color_config_file, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        return {}
-    
     def create_new_config(self):
         """Create a new color configuration file"""
         self.focus_bindings(False)
@@ -601,6 +2386,24 @@ class leagueOverlay:
                             self.bold_drivers = data.get('bold_drivers')
                         except:
                             pass
+                    if data.get('adaptive_refresh') is not None:
+                        self.adaptive_refresh = data.get('adaptive_refresh')
+                    if data.get('broadcast_enabled'):
+                        self.broadcast_enabled = data.get('broadcast_enabled')
+                    if data.get('broadcast_host'):
+                        self.broadcast_host = data.get('broadcast_host')
+                    if data.get('broadcast_port'):
+                        self.broadcast_port = int(data.get('broadcast_port'))
+                    if data.get('smooth_gaps'):
+                        self.smooth_gaps = data.get('smooth_gaps')
+                    if data.get('trend_arrows'):
+                        self.trend_arrows = data.get('trend_arrows')
+                    if data.get('trend_colors'):
+                        self.trend_colors = data.get('trend_colors')
+                    if data.get('points_file'):
+                        self.points_file = data.get('points_file')
+                    if data.get('show_points'):
+                        self.show_points = data.get('show_points')
             except:
                 pass
         return None
@@ -634,7 +2437,19 @@ class leagueOverlay:
                 'refresh_rate': self.refresh_rate,
                 'hide_headers': self.hide_headers,
                 'center_drivers': self.center_drivers,
-                'bold_drivers': self.bold_drivers
+                'bold_drivers': self.bold_drivers,
+                'max_fps': self.max_fps,
+                'smooth_scroll': self.smooth_scroll,
+                'debug_resize': self.debug_resize,
+                'adaptive_refresh': self.adaptive_refresh,
+                'broadcast_enabled': self.broadcast_enabled,
+                'broadcast_host': self.broadcast_host,
+                'broadcast_port': self.broadcast_port,
+                'smooth_gaps': self.smooth_gaps,
+                'trend_arrows': self.trend_arrows,
+                'trend_colors': self.trend_colors,
+                'points_file': self.points_file,
+                'show_points': self.show_points
             }
             with open(self.settings_file, 'w') as f:
                 json.dump(settings, f, indent=2)
@@ -677,6 +2492,7 @@ class leagueOverlay:
             # Set the division normally
             self.driver_colors[key] = division_name
         self.save_color_config()
+        self.invalidate_frame()
 
         # Immediately update the display for this driver
         self.update_driver_row_color(driver_name)
@@ -690,534 +2506,241 @@ class leagueOverlay:
         # Find the driver in current displayed data
         for driver_data in self.displayed_data:
             if driver_data['driver_name'] == driver_name:
-                car_idx = driver_data['car_idx']
-                if car_idx in self.data_widgets:
-                    widgets = self.data_widgets[car_idx]
-                    
-                    # Get the new color
-                    new_color = self.get_driver_color(driver_name)
-                    
-                    widgets['position'].config(fg=new_color)
-                    widgets['division_position'].config(fg=new_color)
-                    widgets['car_number'].config(fg=new_color)
-                    widgets['name'].config(fg=new_color)
-                    
-                break
-
-    def show_context_menu(self, event, driver_name):
-        """Show context menu at cursor position"""
-        menu = self.create_context_menu(driver_name)
-        try:
-            menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            menu.grab_release()
-        
-    def get_driver_color(self, driver_name):
-        """Get color for a driver based on name"""
-        # Check by driver name first
-        if driver_name in self.driver_colors:
-            division_name = self.driver_colors[driver_name]
-            return self.available_colors.get(division_name, self.available_colors["Default"])
- 
-        return self.available_colors["Default"]
-        
-    def load_different_config(self):
-        """Load a different color configuration file"""
-        self.focus_bindings(False)
-        from tkinter import filedialog
-        
-        file_path = filedialog.askopenfilename(
-            title="Select Division Color Config File",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            initialdir="."
-        )
-        
-        if file_path:
-            try:
-                with open(file_path, 'r') as f:
-                    self.driver_colors = json.load(f)
-                self.color_config_file = file_path
-                self.save_settings()  # Save the new config file path
-                
-                # Refresh the display colors immediately
-                self.refresh_driver_colors()
-                
-                # Show brief confirmation
-                original_text = self.load_config_btn['text']
-                self.load_config_btn.config(text="✓", bg='#4CAF50')
-                self.root.after(1000, lambda: self.load_config_btn.config(text=original_text, bg='#555555'))
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load config file: {e}")
-        self.focus_bindings(True)
-
-    def check_for_updates(self):
-        """Check GitHub for newer version"""
-        try:
-            url = "https://api.github.com/repos/steak-and-gravy/league-overlay/releases/latest"
-            with urllib.request.urlopen(url, timeout=5) as response:
-                data = json.loads(response.read().decode())
-                latest = data['tag_name'].lstrip('v')
-                current = VERSION
-                
-                return {
-                    'update_available': version.parse(latest) > version.parse(current),
-                    'latest_version': latest,
-                    'current_version': current,
-                    'download_url': data.get('html_url', '')
-                }
-        except Exception as e:
-            return {
-                'update_available': False,
-                'error': str(e)
-            }
-        
-    def check_and_notify_updates(self):
-        """Check for updates and show notification if available"""
-        if self.update_check_done:
-            return
-            
-        time.sleep(1)  # Wait for GUI to initialize
-        result = self.check_for_updates()
-        self.update_check_done = True
-        
-        if result.get('update_available'):
-            self.latest_version = result['latest_version']
-            msg = f"Update available: v{result['latest_version']}"
-            self.root.after(0, lambda: self.status_label.config(text=msg, fg='#00FF00'))
-            # Auto-hide after 5 seconds
-            self.root.after(5000, lambda: None)
-        
-    def telemetry_loop(self):
-        """Main telemetry loop"""
-        while self.running:
-            try:
-                if not self.is_connected:
-                    if self.ir.startup():
-                        self.is_connected = True
-                        
-                if self.is_connected:
-                    if self.ir.is_connected and self.ir.is_initialized:
-                        self.process_telemetry()
-                    else:
-                        self.is_connected = False
-                        self.ir.shutdown()
-                        
-                time.sleep(self.refresh_rate)
-                
-            except Exception as e:
-                print(f"Telemetry error: {e}")
-                time.sleep(1)
-                
-    def calculate_real_time_positions(self, drivers, live_data, player_car_class_id):
-        """Calculate real-time positions based on track position and lap count"""
-        car_idx_lap = live_data['CarIdxLap']
-        car_idx_lap_dist_pct = live_data['CarIdxLapDistPct']
-        car_idx_class_position = live_data['CarIdxClassPosition']
-    
-        if not car_idx_lap or not car_idx_lap_dist_pct or not car_idx_class_position:
-            return []
-    
-        # Collect all active drivers with their track position data
-        active_drivers = []
-    
-        for car_idx in range(len(car_idx_class_position)):
-            if car_idx_class_position[car_idx] == 0:  # Not in race
-                continue
-            
-            # Find driver info
-            driver_info = None
-            for driver in drivers:
-                if driver.get('CarIdx') == car_idx:
-                    driver_info = driver
-                    break
-                
-            if not driver_info:
-                continue
-            
-            # Filter by class if player is on track
-            if player_car_class_id is not None:
-                if driver_info.get('CarClassID') != player_car_class_id:
-                    continue
-        
-            # Calculate total track position (lap + percentage through current lap)
-            current_lap = car_idx_lap[car_idx]
-            lap_pct = car_idx_lap_dist_pct[car_idx]
-        
-            # Handle invalid lap percentage data
-            if lap_pct < 0 or lap_pct > 1:
-                lap_pct = 0
-            
-            total_track_position = current_lap + lap_pct
-        
-            active_drivers.append({
-                'car_idx': car_idx,
-                'driver_info': driver_info,
-                'total_track_position': total_track_position,
-                'current_lap': current_lap,
-                'lap_pct': lap_pct,
-                'official_position': car_idx_class_position[car_idx]
-            })
-    
-        # Sort by total track position (descending - highest lap + percentage first)
-        active_drivers.sort(key=lambda x: x['total_track_position'], reverse=True)
-    
-        # Assign real-time positions
-        for i, driver in enumerate(active_drivers):
-            driver['real_time_position'] = i + 1
-    
-        return active_drivers
-
-    def get_official_positions(self, drivers, live_data, player_car_class_id):
-        """Get official positions for practice/qualifying sessions"""
-        car_idx_class_position = live_data['CarIdxClassPosition']
-    
-        if not car_idx_class_position:
-            return []
-    
-        active_drivers = []
-    
-        for car_idx in range(len(car_idx_class_position)):
-            if car_idx_class_position[car_idx] == 0:  # Not in race
-                continue
-            
-            # Find driver info
-            driver_info = None
-            for driver in drivers:
-                if driver.get('CarIdx') == car_idx:
-                    driver_info = driver
-                    break
-                
-            if not driver_info:
-                continue
-            
-            # Filter by class if player is on track
-            if player_car_class_id is not None:
-                if driver_info.get('CarClassID') != player_car_class_id:
-                    continue
-        
-            active_drivers.append({
-                'car_idx': car_idx,
-                'driver_info': driver_info,
-                'official_position': car_idx_class_position[car_idx]
-            })
-    
-        # Sort by official position
-        active_drivers.sort(key=lambda x: x['official_position'])
-    
-        return active_drivers
-
-    def process_telemetry(self):
-        """Process telemetry data with conditional real-time position calculations and simplified disconnect handling"""
-        try:
-            # Get driver info directly from telemetry
-            try:
-                drivers = self.ir['DriverInfo']['Drivers']
-                if not drivers:
-                    return
-            except (KeyError, TypeError) as e:
-                print(f"Error getting driver info: {e}")
-                return
-            
-            # Get session type
-            try:
-                session_info = self.ir['SessionInfo']
-                current_session = session_info['Sessions'][self.ir['SessionNum']]
-                session_type = current_session['SessionType']
-                is_race = session_type.lower() == 'race'
-            except (KeyError, TypeError, IndexError):
-                is_race = False
-        
-            # Get player car index and class
-            try:
-                self.player_car_idx = self.ir['PlayerCarIdx']
-            except (KeyError, TypeError):
-                self.player_car_idx = None
-
-            player_car_class_id = None
-            if self.player_car_idx is not None:
-                try:
-                    for driver in drivers:
-                        if driver.get('CarIdx') == self.player_car_idx:
-                            player_car_class_id = driver.get('CarClassID')
-                            break
-                except (KeyError, TypeError):
-                    pass
-        
-            # Get live telemetry
-            live_data = self.ir
-            if not live_data:
-                return
+                car_idx = driver_data['car_idx']
+                if car_idx in self.data_widgets:
+                    widgets = self.data_widgets[car_idx]
+                    
+                    # Point the colored cells at the new division's style
+                    style = self.styles.division_style(self.get_driver_division(driver_name),
+                                                       driver_data['is_player'])
+                    widgets['position'].config(style=style)
+                    widgets['division_position'].config(style=style)
+                    widgets['car_number'].config(style=style)
+                    widgets['name'].config(style=style)
+                    
+                break
+
+    def show_context_menu(self, event, driver_name):
+        """Show context menu at cursor position"""
+        menu = self.create_context_menu(driver_name)
+        try:
+            menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            menu.grab_release()
         
-            # Use different methods based on session type
-            if is_race:
-                # Use real-time positions for races
-                active_drivers = self.calculate_real_time_positions(drivers, live_data, player_car_class_id)
-                position_key = 'real_time_position'
-            else:
-                # Use official positions for practice/qualifying
-                active_drivers = self.get_official_positions(drivers, live_data, player_car_class_id)
-                position_key = 'official_position'
+    def load_different_config(self):
+        """Load a different color configuration file"""
+        self.focus_bindings(False)
+        from tkinter import filedialog
         
-            if not active_drivers:
-                return
-            
-            # Get timing data for gap calculations (always use official method)
-            car_idx_lap = live_data['CarIdxLap']
-            car_idx_est_time = live_data['CarIdxEstTime']
-            car_idx_lap_dist_pct = live_data['CarIdxLapDistPct']
+        file_path = filedialog.askopenfilename(
+            title="Select Division Color Config File",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            initialdir="."
+        )
         
-            # Calculate division positions using the appropriate position type
-            all_drivers_with_colors = []
-            for driver in active_drivers:
-                driver_color = self.get_driver_color(driver['driver_info'].get('UserName', ''))
-                all_drivers_with_colors.append({
-                    'car_idx': driver['car_idx'],
-                    'position': driver[position_key],
-                    'color': driver_color,
-                    'official_position': driver.get('official_position', driver[position_key])
-                })
-
-            # Calculate division positions using display positions
-            division_positions = {}
-            for color in set(d['color'] for d in all_drivers_with_colors):
-                same_color = [d for d in all_drivers_with_colors if d['color'] == color]
-                same_color.sort(key=lambda x: x['position'])
-                for i, driver in enumerate(same_color):
-                    division_positions[driver['car_idx']] = i + 1
-        
-            # Process race standings
-            self.race_data = []
-        
-            for driver in active_drivers:
-                car_idx = driver['car_idx']
-                driver_info = driver['driver_info']
-            
-                # Use the appropriate position for display
-                position = driver[position_key]
-            
-                # Get current driver's color and division position
-                current_driver_color = self.get_driver_color(driver_info.get('UserName', ''))
-                current_color_position = division_positions.get(car_idx, position)
-
-                # Calculate gap - check for disconnected drivers
-                if current_color_position == 1:
-                    gap = "Leader"
-                elif is_race:
-                    # Find division drivers using display positions
-                    same_color_drivers = []
-                    for temp_driver in active_drivers:
-                        temp_color = self.get_driver_color(temp_driver['driver_info'].get('UserName', ''))
-                        if temp_color == current_driver_color:
-                            same_color_drivers.append({
-                                'car_idx': temp_driver['car_idx'],
-                                'position': temp_driver[position_key]
-                            })
+        if file_path:
+            try:
+                with open(file_path, 'r') as f:
+                    self.driver_colors = json.load(f)
+                self.color_config_file = file_path
+                self.save_settings()  # Save the new config file path
                 
-                    same_color_drivers.sort(key=lambda x: x['position'])
+                # Refresh the display colors immediately
+                self.refresh_driver_colors()
                 
-                    # Find current driver's position in the list
-                    current_pos_index = None
-                    for i, temp_driver in enumerate(same_color_drivers):
-                        if temp_driver['car_idx'] == car_idx:
-                            current_pos_index = i
-                            break
+                # Show brief confirmation
+                original_text = self.load_config_btn['text']
+                self.load_config_btn.config(text="✓", bg='#4CAF50')
+                self.root.after(1000, lambda: self.load_config_btn.config(text=original_text, bg='#555555'))
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load config file: {e}")
+        self.focus_bindings(True)
+
+    def check_for_updates(self):
+        """Check GitHub for newer version"""
+        try:
+            url = "https://api.github.com/repos/steak-and-gravy/league-overlay/releases/latest"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                data = json.loads(response.read().decode())
+                latest = data['tag_name'].lstrip('v')
+                current = VERSION
                 
-                    if current_pos_index is not None and current_pos_index > 0:
-                        # Get car ahead in division
-                        car_ahead_idx = same_color_drivers[current_pos_index - 1]['car_idx']
-                    
-                        # Both cars connected, calculate gap normally
-                        current_est_time = car_idx_est_time[car_idx]
-                        ahead_est_time = car_idx_est_time[car_ahead_idx]
-                        current_lap = car_idx_lap[car_idx]
-                        ahead_lap = car_idx_lap[car_ahead_idx]
-    
-                        time_gap = 0.0
-                        if current_est_time > 0 and ahead_est_time > 0:
-                            time_gap = ahead_est_time - current_est_time
-                        else:
-                            # Fallback to distance calculation
-                            time_gap = (car_idx_lap_dist_pct[car_ahead_idx] - car_idx_lap_dist_pct[car_idx]) * self.get_fastest_lap_time(current_session)
-        
-                        # Adjust for lap differences
-                        lap_difference = ahead_lap - current_lap
-                        
-                        # If less than 1 FULL lap down
-                        if lap_difference == 1 and car_idx_lap_dist_pct[car_ahead_idx] < car_idx_lap_dist_pct[car_idx]:
-                            time_gap += self.get_fastest_lap_time(current_session)
-                            lap_difference = 0
-
-                        if lap_difference > 0:
-                            gap = f"{lap_difference}L"
-                        else:
-                            if time_gap < 0:
-                                time_gap *= -1 # just make it positive for now
-                            if time_gap < 60:
-                                gap = f"{time_gap:.1f}"
-                            else:
-                                minutes = int(time_gap // 60)
-                                seconds = time_gap % 60
-                                gap = f"{minutes}:{seconds:04.1f}"
-                    else:
-                        gap = ""
-                else:  # Practice or Qualifying
-                    same_color_drivers = [d for d in all_drivers_with_colors if d['color'] == current_driver_color]
-                    same_color_drivers.sort(key=lambda x: x['position'])
-
-                    if len(same_color_drivers) >= current_color_position - 1:
-                        car_ahead_idx = same_color_drivers[current_color_position - 2]['car_idx']
-                        current_best = self.get_best_lap_from_session_info(current_session, car_idx)
-                        ahead_best = self.get_best_lap_from_session_info(current_session, car_ahead_idx)
-                        if current_best > 0 and ahead_best > 0:
-                            time_gap = current_best - ahead_best
-                            gap = f"{time_gap:.3f}"
-                        else:
-                            gap = ""
-                    else:
-                        gap = ""
-            
-                # Mark if this is the player
-                is_player = (car_idx == self.player_car_idx)
-            
-                self.race_data.append({
-                    'position': position,
-                    'division_position': current_color_position,
-                    'car_number': driver_info.get('CarNumber', ''),
-                    'driver_name': driver_info.get('UserName', ''),
-                    'gap': gap,
-                    'car_idx': car_idx,
-                    'is_player': is_player
-                })
-        
-            # Sort by display position
-            self.race_data.sort(key=lambda x: x['position'])
-    
+                return {
+                    'update_available': version.parse(latest) > version.parse(current),
+                    'latest_version': latest,
+                    'current_version': current,
+                    'download_url': data.get('html_url', '')
+                }
         except Exception as e:
-            print(f"Processing error: {e}")
+            return {
+                'update_available': False,
+                'error': str(e)
+            }
+        
+    def check_and_notify_updates(self):
+        """Check for updates and show notification if available"""
+        if self.update_check_done:
+            return
+            
+        time.sleep(1)  # Wait for GUI to initialize
+        result = self.check_for_updates()
+        self.update_check_done = True
+        
+        if result.get('update_available'):
+            self.latest_version = result['latest_version']
+            msg = f"Update available: v{result['latest_version']}"
+            self.root.after(0, lambda: self.status_label.config(text=msg, fg='#00FF00'))
+            # Auto-hide after 5 seconds
+            self.root.after(5000, lambda: None)
+        
+    def load_render_settings(self):
+        """Load the render loop frame cap and scroll behavior from settings"""
+        if os.path.exists(self.settings_file):
+            try:
+                with open(self.settings_file, 'r') as f:
+                    data = json.load(f)
+                    if data.get('max_fps'):
+                        self.max_fps = max(1, min(60, int(data.get('max_fps'))))
+                    if data.get('smooth_scroll'):
+                        self.smooth_scroll = data.get('smooth_scroll')
+                    if data.get('debug_resize'):
+                        self.debug_resize = data.get('debug_resize')
+            except:
+                pass
 
-    def get_fastest_lap_time(self, current_session):
-        fastest_time = float('inf')
-        for driver in current_session['ResultsPositions']:
-            best_lap = driver['FastestTime']
-            if 0 < best_lap < fastest_time:
-                fastest_time = best_lap
-        return fastest_time if fastest_time != float('inf') else 90
+    def mark_dirty(self, *regions):
+        """Flag regions (header, status, rows, scroll) for the next frame"""
+        for region in regions:
+            self.dirty[region] = True
 
-    def get_best_lap_from_session_info(self, current_session, car_idx):
+    def render_frame(self):
+        """One frame of the capped render loop, only dirty regions are redrawn"""
+        if not self.running:
+            return
         try:
-            if 'ResultsPositions' in current_session:
-                for driver in current_session['ResultsPositions']:
-                    if driver.get('CarIdx') == car_idx and 'FastestTime' in driver:
-                        return driver['FastestTime']
-        except (KeyError, TypeError, IndexError):
-            pass
-        return 90 # default to 90 if no best lap found
-            
-    def update_gui(self):
-        """Update GUI with race data"""
-        while self.running:
-            try:
-                # Wait 3 seconds after startup before updating status
-                if time.time() - self.startup_time < 3.0:
-                    time.sleep(0.1)
-                    continue
-                if self.is_connected:
-                    # Get session type for status display
-                    try:
-                        session_info = self.ir['SessionInfo']
-                        current_session = session_info['Sessions'][self.ir['SessionNum']]
-                        session_type = current_session['SessionType']
-                        status_text = f"Connected - Live Data ({session_type})"
-                    except (KeyError, TypeError, IndexError, AttributeError):
-                        status_text = "Connected - Live Data"
-
-                    self.root.after(0, lambda text=status_text: self.status_label.config(text=text, fg='green'))
-                    self.root.after(0, self.display_race_data)
-                else:
-                    # Cancel hide timer if disconnected
-                    if self.status_hide_timer:
-                        self.root.after_cancel(self.status_hide_timer)
-                        self.status_hide_timer = None
-                    self.root.after(0, lambda: self.status_label.pack(pady=5))
-                    self.root.after(0, lambda: self.status_label.config(text="Connecting to iRacing...", fg='orange'))
-                    
-                time.sleep(self.refresh_rate)
-                
-            except Exception as e:
-                print(f"GUI update error: {e}")
-                time.sleep(1)
+            self.check_dirty()
+
+            if self.dirty['header']:
+                self.dirty['header'] = False
+                self.create_headers()
+
+            # Wait 3 seconds after startup before updating status
+            if self.dirty['status'] and time.time() - self.startup_time >= 3.0:
+                self.dirty['status'] = False
+                self.render_status()
+
+            if self.dirty['rows']:
+                self.dirty['rows'] = False
+                self.display_race_data()
+
+            if self.dirty['scroll']:
+                self.dirty['scroll'] = False
+                if self.auto_center_enabled and time.time() - self.last_manual_scroll > self.manual_scroll_timeout:
+                    self.center_on_player(self.displayed_data)
+        except Exception as e:
+            print(f"GUI update error: {e}")
+
+        self.root.after(max(1, int(1000 / self.max_fps)), self.render_frame)
+
+    def check_dirty(self):
+        """Compare cheap Python-side state to decide which regions need redrawing"""
+        if self.latest_standings[0] != self.displayed_revision:
+            self.dirty['rows'] = True
+
+        # Resume auto-centering once the manual scroll hold runs out
+        if not self.auto_center_resumed and time.time() - self.last_manual_scroll > self.manual_scroll_timeout:
+            self.auto_center_resumed = True
+            # Pick up from wherever the user left the view
+            if self.displayed_data:
+                content_height = len(self.displayed_data) * self.auto_center.row_pitch
+                self.auto_center.sync(self.canvas.yview()[0] * content_height)
+            self.dirty['scroll'] = True
+
+    def status_for_state(self):
+        """Status text and color for the current connection state"""
+        state = self.connection.state
+        if state == CONNECTION_CONNECTED:
+            if self.session_type:
+                return f"Connected - Live Data ({self.session_type})", 'green'
+            return "Connected - Live Data", 'green'
+        if state == CONNECTION_STALE:
+            return "Connected - Waiting for data", 'yellow'
+        return "Connecting to iRacing...", 'orange'
+
+    def render_status(self):
+        """Update the status label, only called when the status changed"""
+        status_text, status_color = self.status_for_state()
+        if not self.is_connected:
+            # Cancel hide timer if disconnected
+            if self.status_hide_timer:
+                self.root.after_cancel(self.status_hide_timer)
+                self.status_hide_timer = None
+            self.status_label.pack(pady=5)
+        self.status_label.config(text=status_text, fg=status_color)
     
-    def get_dynamic_column_sizes(self, is_header=False):
-        """Calculate column minimum sizes based on current window width"""
-        # Account for scrollbar and padding
-        scrollbar_width = 0 if not is_header else 4
-        padding = 2  # Total padding from margins
-        available_width = self.width - scrollbar_width - padding
-
-        # Define percentage allocations (should add up to 1.0)
-        percentages = {
-            'pos': 0.11,
-            'div_pos': 0.11,
-            'car_num': 0.13,
-            'driver': 0.46,
-            'gap': 0.19
-        }
-        
-        # Calculate actual pixel widths
-        return {
-            'pos': int(available_width * percentages['pos']),
-            'div_pos': int(available_width * percentages['div_pos']),
-            'car_num': int(available_width * percentages['car_num']),
-            'driver': int(available_width * percentages['driver']),
-            'gap': int(available_width * percentages['gap'])
-        }
-                
     def display_race_data(self):
-        """Display race data in the GUI - optimized to prevent flicker"""
-        if not self.race_data:
+        """Display race data in the GUI - only applies the rows that changed"""
+        # The snapshot's rows are ours until released, the engine writes the next ones elsewhere
+        revision, race_data, changes = self.acquire_standings()
+        try:
+            self.display_standings(revision, race_data, changes)
+        finally:
+            self.release_standings()
+
+    def display_standings(self, revision, race_data, changes):
+        """Apply a held snapshot to the rows on screen and keep a copy of what is shown"""
+        if not race_data:
+            self.displayed_revision = revision
             return
             
         # Replace the existing filter section with:
         if self.show_only_my_division and self.player_car_idx is not None:
             # Find player's color
             player_color = None
-            for driver_data in self.race_data:
+            for driver_data in race_data:
                 if driver_data['car_idx'] == self.player_car_idx:
                     player_color = self.get_driver_color(driver_data['driver_name'])
                     break
                 
             if player_color:
-                current_data = [d for d in self.race_data if self.get_driver_color(d['driver_name']) == player_color]
+                current_data = [d for d in race_data if self.get_driver_color(d['driver_name']) == player_color]
             else:
-                current_data = self.race_data
+                current_data = race_data
         elif self.current_division_filter is not None:
             # Filter by specific division
             division_color = self.available_colors.get(self.current_division_filter)
             if division_color:
-                current_data = [d for d in self.race_data if self.get_driver_color(d['driver_name']) == division_color]
+                current_data = [d for d in race_data if self.get_driver_color(d['driver_name']) == division_color]
             else:
-                current_data = self.race_data
+                current_data = race_data
         else:
-            current_data = self.race_data
-        
-        # Check if we need to rebuild the display
-        need_rebuild = (len(current_data) != len(self.displayed_data) or
-                       any(d1['car_idx'] != d2['car_idx'] for d1, d2 in zip(current_data, self.displayed_data)))
-        
-        if need_rebuild:
-            self.rebuild_display(current_data)
+            current_data = race_data
+
+        # The engine's change set only covers the step from the snapshot on screen
+        view = (self.show_only_my_division, self.current_division_filter)
+        if revision == self.displayed_revision + 1 and view == self.displayed_view:
+            diffs = self.diff_rows(self.displayed_data, current_data, changes)
         else:
-            self.update_existing_display(current_data)
-            
-        # Auto-center on player if enough time has passed since manual scroll
-        if (self.player_car_idx is not None and 
-            time.time() - self.last_manual_scroll > self.manual_scroll_timeout):
-            self.center_on_player(current_data)
+            diffs = self.diff_rows(self.displayed_data, current_data)
+        self.displayed_revision = revision
+        self.displayed_view = view
 
-        self.displayed_data = current_data.copy()
+        if diffs:
+            self.apply_row_diffs(diffs, current_data)
+            # Rows moved or changed, the player may need re-centering
+            self.dirty['scroll'] = True
+
+        # The engine reuses its rows, keep a copy of what is on screen
+        displayed_data = self.displayed_data
+        displayed_data.clear()
+        for row in current_data:
+            shown = self.displayed_rows[row.car_idx]
+            shown.copy_from(row)
+            displayed_data.append(shown)
         
     def center_on_player(self, current_data):
-        """Center the view on the player's position"""
+        """Keep the player's row within the center band of the view"""
         if not current_data or self.player_car_idx is None:
             return
             
@@ -1230,137 +2753,62 @@ class leagueOverlay:
                 
         if player_index is None:
             return
-            
-        # Wait a frame to ensure canvas is properly updated
-        self.root.after(1, lambda: self._do_center_scroll(current_data))
-    
-    def _do_center_scroll(self, current_data):
-        """Actually perform the centering scroll"""
-        try:
-            # Force canvas update
-            self.canvas.update_idletasks()
-        
-            if not current_data:
-                return
-            
-            # Find the player's index in the active drivers list
-            player_active_index = None
-            for i, driver_data in enumerate(current_data):
-                if driver_data['car_idx'] == self.player_car_idx:
-                    player_active_index = i
-                    break
-                
-            if player_active_index is None:
-                return
-            
-            # Get canvas and content dimensions
-            canvas_height = self.canvas.winfo_height()
-            bbox = self.canvas.bbox("all")
-            if not bbox:
-                return
-                
-            total_height = bbox[3] - bbox[1]
-        
-            # If everything fits in the canvas, just scroll to top
-            if total_height <= canvas_height:
-                self.canvas.yview_moveto(0)
-                return
-        
-            # Calculate how many items are visible at once
-            item_height = total_height / len(current_data)
-            visible_items = canvas_height / item_height
-
-            # Calculate the ideal scroll position to center the player
-            # We want the player to be in the middle of the visible area
-            center_position = player_active_index - (visible_items / 2)
-
-            # Convert to a fraction (0.0 to 1.0)
-            max_scroll_position = len(current_data)
-            if max_scroll_position <= 0:
-                scroll_fraction = 0.0
-            else:
-                scroll_fraction = center_position / max_scroll_position
-                scroll_fraction = max(0.0, min(1.0, scroll_fraction))
 
-            # Apply the scroll
-            self.canvas.yview_moveto(0.0)
-            self.canvas.yview_moveto(scroll_fraction)
-        
-        except Exception as e:
-            print(f"Error centering on player: {e}")
+        # Row geometry is known from the fixed row height, no layout queries needed
+        top = self.auto_center.update(player_index, len(current_data))
+        if top is not None:
+            self.canvas.yview_moveto(top / (len(current_data) * self.auto_center.row_pitch))
+        if self.auto_center.animating():
+            self.dirty['scroll'] = True
 
     def refresh_layout(self):
-        """Refresh the layout after window resize"""
-        # Recreate headers
-        self.create_headers()
-
-        # Force a display refresh to update row widths
-        if hasattr(self, 'displayed_data') and self.displayed_data:
-            self.rebuild_display(self.displayed_data)
-        
-    def rebuild_display(self, data):
-        """Rebuild the entire display"""
-        # Clear existing data widgets
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-            
-        self.data_widgets = {}
-        
-        # Create new widgets
-        for i, driver_data in enumerate(data):
-            self.create_driver_row(i, driver_data)
+        """Refresh the layout after window resize or a name alignment change"""
+        # Column widths follow the window on their own, only the name anchor is per row
+        name_anchor = "center" if self.center_drivers else "w"
+        for widgets in self.data_widgets.values():
+            widgets['name'].config(anchor=name_anchor)
+        self.mark_dirty('scroll')
 
     def create_driver_row(self, index, data):
-        """Create a new driver row using grid layout"""
-        row_frame = tk.Frame(self.scrollable_frame, bg='black')
+        """Create a new driver row, cells placed in the shared column layout"""
+        # Placed children never resize the frame, so the fixed height auto-centering relies on holds
+        row_frame = tk.Frame(self.scrollable_frame, bg='black', height=self.row_height)
         row_frame.pack(fill=tk.X, expand=True, padx=5, pady=1)
     
-        sizes = self.get_dynamic_column_sizes()
-        
-        # Configure same grid with dynamic sizes and uniform groups
-        row_frame.grid_columnconfigure(0, weight=sizes['pos'], minsize=sizes['pos'], uniform="col0")
-        row_frame.grid_columnconfigure(1, weight=sizes['div_pos'], minsize=sizes['div_pos'], uniform="col1")
-        row_frame.grid_columnconfigure(2, weight=sizes['car_num'], minsize=sizes['car_num'], uniform="col2")
-        row_frame.grid_columnconfigure(3, weight=sizes['driver'], minsize=sizes['driver'], uniform="col3")
-        row_frame.grid_columnconfigure(4, weight=sizes['gap'], minsize=sizes['gap'], uniform="col4")
-    
-        # Get driver color
-        color = self.get_driver_color(data['driver_name'])
+        # Shared styles for the division color and player highlight
+        is_player = data['is_player']
+        cell_style = self.styles.division_style(self.get_driver_division(data['driver_name']), is_player)
+        gap_style = self.styles.gap_style(is_player)
     
         # Highlight player row
-        if data['is_player']:
-            row_frame.configure(bg='#1a1a1a')
+        if is_player:
+            row_frame.configure(bg=self.styles.row_background(True))
     
-        # Create labels using grid instead of pack
-        pos_label = tk.Label(row_frame, text=str(data['position']), 
-                        fg=color, bg=row_frame['bg'], 
-                        font=('Arial', 9, 'bold' if data['is_player'] or self.bold_drivers else 'normal'))
-        pos_label.grid(row=0, column=0, sticky='ew', padx=2)
-
-        division_pos_label = tk.Label(row_frame, text=str(data['division_position']), 
-                        fg=color, bg=row_frame['bg'], 
-                        font=('Arial', 9, 'bold' if data['is_player'] or self.bold_drivers else 'normal'))
-        division_pos_label.grid(row=0, column=1, sticky='ew', padx=2)
+        # Create labels in the shared column layout
+        pos_label = ttk.Label(row_frame, text=str(data['position']), style=cell_style)
+        self.columns.place(pos_label, 'pos')
+
+        division_pos_label = ttk.Label(row_frame, text=str(data['division_position']), style=cell_style)
+        self.columns.place(division_pos_label, 'div_pos')
     
-        car_label = tk.Label(row_frame, text=data['car_number'], 
-                        fg=color, bg=row_frame['bg'], 
-                        font=('Arial', 9, 'bold' if data['is_player'] or self.bold_drivers else 'normal'))
-        car_label.grid(row=0, column=2, sticky='ew', padx=2)
+        car_label = ttk.Label(row_frame, text=data['car_number'], style=cell_style)
+        self.columns.place(car_label, 'car_num')
 
         name_anchor = "w" # Left align name
         if self.center_drivers:
             name_anchor = "center" # Center name
-        name_label = tk.Label(row_frame, text=data['driver_name'], 
-                    fg=color, bg=row_frame['bg'], 
-                    font=('Arial', 9, 'bold' if data['is_player'] or self.bold_drivers else 'normal'),
-                    anchor=name_anchor, width=sizes['driver'])  
-        name_label.grid(row=0, column=3, sticky='ew', padx=2)
+        name_label = ttk.Label(row_frame, text=data['driver_name'], style=cell_style, anchor=name_anchor)
+        self.columns.place(name_label, 'driver')
     
-        gap_label = tk.Label(row_frame, text=data['gap'], 
-                        fg='white', bg=row_frame['bg'], 
-                        font=('Arial', 9, 'bold' if data['is_player'] or self.bold_drivers else 'normal'), 
-                        anchor="w")
-        gap_label.grid(row=0, column=4, sticky='', padx=2)
+        gap_label = ttk.Label(row_frame, text=self.gap_text(data), style=self.gap_cell_style(data),
+                              anchor="center")
+        self.columns.place(gap_label, 'gap')
+
+        # Championship projection only when the optional column is shown
+        points_label = None
+        if 'points' in self.columns.geometry:
+            points_label = ttk.Label(row_frame, text=data['points'], style=gap_style, anchor="center")
+            self.columns.place(points_label, 'points')
         
         # Bind right-click to row frame and all labels for context menu
         row_frame.bind("<Button-3>", lambda e: self.show_context_menu(e, data['driver_name']))
@@ -1369,6 +2817,8 @@ class leagueOverlay:
         car_label.bind("<Button-3>", lambda e: self.show_context_menu(e, data['driver_name']))
         name_label.bind("<Button-3>", lambda e: self.show_context_menu(e, data['driver_name']))
         gap_label.bind("<Button-3>", lambda e: self.show_context_menu(e, data['driver_name']))
+        if points_label:
+            points_label.bind("<Button-3>", lambda e: self.show_context_menu(e, data['driver_name']))
         
         # Store widget references
         self.data_widgets[data['car_idx']] = {
@@ -1377,91 +2827,117 @@ class leagueOverlay:
             'division_position': division_pos_label,
             'car_number': car_label,
             'name': name_label,
-            'gap': gap_label
+            'gap': gap_label,
+            'points': points_label
         } 
         
-    def update_existing_display(self, data):
-        """Update existing widgets with new data"""
-        for i, driver_data in enumerate(data):
-            car_idx = driver_data['car_idx']
-            if car_idx in self.data_widgets:
-                widgets = self.data_widgets[car_idx]
-                
-                # Get driver color
-                color = self.get_driver_color(driver_data['driver_name'])
-                
-                # Update row background for player
-                bg_color = '#1a1a1a' if driver_data['is_player'] else 'black'
-                widgets['frame'].configure(bg=bg_color)
-                
-                # Update font weight for player
-                font_weight = 'bold' if driver_data['is_player'] or self.bold_drivers else 'normal'
-                
-                # Update only if values changed
-                if widgets['position']['text'] != str(driver_data['position']):
-                    widgets['position'].config(text=str(driver_data['position']), fg=color, bg=bg_color,
-                                            font=('Arial', 9, font_weight))
-
-                if widgets['division_position']['text'] != str(driver_data['division_position']):
-                    widgets['division_position'].config(text=str(driver_data['division_position']), fg=color, bg=bg_color,
-                                            font=('Arial', 9, font_weight))
-                    
-                if widgets['car_number']['text'] != driver_data['car_number']:
-                    widgets['car_number'].config(text=driver_data['car_number'], fg=color, bg=bg_color,
-                                            font=('Arial', 9, font_weight))
-                
-                if widgets['name']['text'] != driver_data['driver_name']:
-                    widgets['name'].config(text=driver_data['driver_name'], fg=color, bg=bg_color,
-                                            font=('Arial', 9, font_weight))
-                    
-                if widgets['gap']['text'] != driver_data['gap']:
-                    widgets['gap'].config(text=driver_data['gap'], bg=bg_color,
-                                         font=('Arial', 9, font_weight))
-                                                  
-    def reorder_and_update_display(self, data):
-        """Reorder existing widgets and update their data without rebuilding"""
-        # Temporarily disable canvas updates
-        self.scrollable_frame.update_idletasks()
-    
-        # Get all current widget frames
-        existing_frames = []
-        for driver_data in data:
-            car_idx = driver_data['car_idx']
-            if car_idx in self.data_widgets:
-                existing_frames.append(self.data_widgets[car_idx]['frame'])
-    
-        # Repack frames in correct order
-        for i, frame in enumerate(existing_frames):
-            frame.pack_forget()
-    
-        for i, driver_data in enumerate(data):
-            car_idx = driver_data['car_idx']
-            if car_idx in self.data_widgets:
-                widgets = self.data_widgets[car_idx]
-                frame = widgets['frame']
-            
-                # Repack in correct position
-                frame.pack(fill=tk.X, padx=5, pady=1)
-            
-                # Update data
-                color = self.get_driver_color(driver_data['driver_name'])
-                bg_color = '#1a1a1a' if driver_data['is_player'] else 'black'
-                font_weight = 'bold' if driver_data['is_player'] else 'normal'
-            
-                # Update frame background
-                frame.configure(bg=bg_color)
-            
-                # Update all widgets at once
-                widgets['position'].config(text=str(driver_data['position']), fg=color, bg=bg_color,
-                                    font=('Arial', 9, font_weight))
-                widgets['division_position'].config(text=str(driver_data['division_position']), fg=color, bg=bg_color,
-                                    font=('Arial', 9, font_weight))
-                widgets['car_number'].config(text=driver_data['car_number'], fg=color, bg=bg_color,
-                                    font=('Arial', 9, font_weight))
-                widgets['name'].config(text=driver_data['driver_name'], fg=color, bg=bg_color,
-                                    font=('Arial', 9, font_weight))
-                widgets['gap'].config(text=driver_data['gap'], fg='white', bg=bg_color,
-                                    font=('Arial', 9, font_weight))   
+    def apply_row_diffs(self, diffs, data):
+        """Apply row diffs from the engine, untouched rows cost no Tk calls"""
+        first_moved = None
+        for diff in diffs:
+            if diff.kind == ROW_REMOVED:
+                widgets = self.data_widgets.pop(diff.car_idx, None)
+                if widgets:
+                    widgets['frame'].destroy()
+            elif diff.kind == ROW_ADDED:
+                self.create_driver_row(diff.index, data[diff.index])
+                first_moved = diff.index if first_moved is None else min(first_moved, diff.index)
+            elif diff.kind == ROW_MOVED:
+                first_moved = diff.index if first_moved is None else min(first_moved, diff.index)
+            elif diff.kind == CELL_CHANGED:
+                self.update_row_cells(data[diff.index], diff.fields)
+            elif diff.kind == PLAYER_CHANGED:
+                self.update_row_player(data[diff.index])
+
+        # Repack from the first row out of place, rows above it stay where they are
+        if first_moved is not None:
+            frames = [self.data_widgets[d['car_idx']]['frame'] for d in data[first_moved:]
+                      if d['car_idx'] in self.data_widgets]
+            for frame in frames:
+                frame.pack_forget()
+            for frame in frames:
+                frame.pack(fill=tk.X, expand=True, padx=5, pady=1)
+
+    def update_row_cells(self, driver_data, fields):
+        """Update the labels of the cells that changed"""
+        widgets = self.data_widgets.get(driver_data['car_idx'])
+        if not widgets:
+            return
+        cell_widgets = {
+            'position': widgets['position'],
+            'division_position': widgets['division_position'],
+            'car_number': widgets['car_number'],
+            'driver_name': widgets['name'],
+            'gap': widgets['gap'],
+            'points': widgets['points']
+        }
+        for field in fields:
+            if field in ('gap', 'trend'):
+                continue
+            if cell_widgets[field] is not None:
+                cell_widgets[field].config(text=str(driver_data[field]))
+        if 'gap' in fields or 'trend' in fields:
+            widgets['gap'].config(text=self.gap_text(driver_data), style=self.gap_cell_style(driver_data))
+
+        # A different driver in the car may belong to another division
+        if 'driver_name' in fields:
+            style = self.styles.division_style(self.get_driver_division(driver_data['driver_name']),
+                                               driver_data['is_player'])
+            for key in ('position', 'division_position', 'car_number', 'name'):
+                widgets[key].config(style=style)
+
+    def update_row_player(self, driver_data):
+        """Switch a row between the player and normal styles"""
+        widgets = self.data_widgets.get(driver_data['car_idx'])
+        if not widgets:
+            return
+        is_player = driver_data['is_player']
+        style = self.styles.division_style(self.get_driver_division(driver_data['driver_name']), is_player)
+        widgets['frame'].configure(bg=self.styles.row_background(is_player))
+        for key in ('position', 'division_position', 'car_number', 'name'):
+            widgets[key].config(style=style)
+        widgets['gap'].config(style=self.gap_cell_style(driver_data))
+        if widgets['points'] is not None:
+            widgets['points'].config(style=self.styles.gap_style(is_player))
+
+    def gap_text(self, row):
+        """Gap cell text, with the trend arrow when enabled"""
+        if self.trend_arrows:
+            return row['gap'] + TREND_ARROWS[row['trend']]
+        return row['gap']
+
+    def gap_cell_style(self, row):
+        """Gap cell style, colored by trend when enabled"""
+        return self.styles.gap_style(row['is_player'], row['trend'] if self.trend_colors else TREND_STEADY)
+
+    def set_gap_trend(self, trend_arrows, trend_colors):
+        """Switch the trend arrows and colors, the gap cells on screen follow at once"""
+        self.trend_arrows = trend_arrows
+        self.trend_colors = trend_colors
+        self.track_gap_trend = trend_arrows or trend_colors
+        self.invalidate_frame()
+        for row in self.displayed_data:
+            widgets = self.data_widgets.get(row.car_idx)
+            if widgets:
+                widgets['gap'].config(text=self.gap_text(row), style=self.gap_cell_style(row))
+
+    def set_show_points(self, show_points):
+        """Load or drop the points table and rebuild the rows with or without the column"""
+        self.show_points = show_points
+        self.points.load(self.points_file if show_points else None)
+        self.columns = ColumnLayout(show_points and self.points.enabled)
+        self.invalidate_frame()
+        for widgets in self.data_widgets.values():
+            widgets['frame'].destroy()
+        self.data_widgets = {}
+        self.displayed_data = []
+        self.displayed_revision = -1
+        self.mark_dirty('header', 'rows')
+
+    def apply_styles(self):
+        """Push bold_drivers and division colors into the shared styles"""
+        self.styles.set_bold_rows(self.bold_drivers)
+        self.styles.set_division_colors(self.available_colors)
 
     def open_settings(self):
         """Open the settings window"""
@@ -1476,10 +2952,29 @@ class leagueOverlay:
     def refresh_driver_colors(self):
         """Refresh all driver colors in the current display"""
         self.driver_colors = self.load_color_config()
+        self.invalidate_frame()
         if hasattr(self, 'displayed_data') and self.displayed_data:
             for driver_data in self.displayed_data:
                 self.update_driver_row_color(driver_data['driver_name'])           
                             
+    def set_display_hidden(self, widget, hidden):
+        """Track whether the overlay window is on screen, child widgets map and unmap too"""
+        if widget is self.root:
+            self.display_hidden = hidden
+
+    def set_broadcast(self, enabled):
+        """Start or stop the standings broadcast server for browser sources"""
+        if enabled and self.standings_server is None:
+            try:
+                server = StandingsServer(self, self.broadcast_host, self.broadcast_port)
+                server.start()
+                self.standings_server = server
+            except Exception as e:
+                print(f"Broadcast server error: {e}")
+        elif not enabled and self.standings_server is not None:
+            self.standings_server.stop()
+            self.standings_server = None
+
     def run(self):
         """Run the application"""
         try:
@@ -1488,13 +2983,157 @@ class leagueOverlay:
             pass
         finally:
             self.running = False
+            self.set_broadcast(False)
             if self.is_connected:
                 self.ir.shutdown()
 
-import tkinter as tk
-from tkinter import ttk, colorchooser, messagebox, filedialog
-import json
-import os
+class HeadlessStandings(StandingsEngine):
+    """Standings engine without a window, each new snapshot is written out as JSON"""
+    def __init__(self, output='-', settings_file="LeagueOverlay.config", league_config=None):
+        super().__init__()
+        self.output = output
+        self.output_socket = None
+        self.load_settings(settings_file, league_config)
+        if output != 'none':
+            self.standings_listeners.append(self.write_standings)
+
+    def load_settings(self, settings_file, league_config=None):
+        """Pick up the league config and division colors the overlay was last using"""
+        data = {}
+        if os.path.exists(settings_file):
+            try:
+                with open(settings_file, 'r') as f:
+                    data = json.load(f)
+            except:
+                pass
+        league_config = league_config or data.get('league_config')
+        if league_config and os.path.exists(league_config):
+            self.color_config_file = league_config
+        self.driver_colors = self.load_color_config()
+        self.available_colors.update(data.get('division_colors', {}))
+        if data.get('refresh_rate'):
+            self.refresh_rate = data.get('refresh_rate')
+        if data.get('adaptive_refresh') is not None:
+            self.adaptive_refresh = data.get('adaptive_refresh')
+        if data.get('smooth_gaps'):
+            self.smooth_gaps = data.get('smooth_gaps')
+        if data.get('trend_arrows') or data.get('trend_colors'):
+            self.track_gap_trend = True
+        if data.get('show_points'):
+            self.points.load(data.get('points_file', self.points_file))
+
+    def snapshot_json(self, revision, race_data):
+        """One compact JSON line for a standings snapshot"""
+        rows = [{
+            'position': row['position'],
+            'division_position': row['division_position'],
+            'car_number': row['car_number'],
+            'driver_name': row['driver_name'],
+            'cust_id': (self.session_stats.driver(row['car_idx']) or {}).get('UserID'),
+            'division': self.get_driver_division(row['driver_name']),
+            'gap': row['gap'],
+            'points': row['points'],
+            'trend': TREND_NAMES[row['trend']],
+            'laps_to_catch': row['laps_to_catch'],
+            'is_player': row['is_player'],
+        } for row in race_data]
+        return json.dumps({'revision': revision, 'session_type': self.session_type, 'rows': rows},
+                          separators=(',', ':'))
+
+    def write_standings(self, snapshot):
+        """Write a snapshot to stdout, a socket or a file, unchanged standings are skipped"""
+        revision, race_data, changes = snapshot
+        if not changes and revision > 1:
+            return
+        line = self.snapshot_json(revision, race_data) + '\n'
+        try:
+            if self.output == '-':
+                sys.stdout.write(line)
+                sys.stdout.flush()
+            elif self.output.startswith(('tcp://', 'udp://')):
+                self.send_line(line.encode('utf-8'))
+            else:
+                # Readers only ever see a complete file
+                temp_file = self.output + '.tmp'
+                with open(temp_file, 'w') as f:
+                    f.write(line)
+                os.replace(temp_file, self.output)
+        except Exception as e:
+            print(f"Standings output error: {e}", file=sys.stderr)
+            self.close_socket()
+
+    def send_line(self, data):
+        """Send one JSON line, reconnecting on the next snapshot if the socket failed"""
+        target = urllib.parse.urlsplit(self.output)
+        if target.scheme == 'udp':
+            if self.output_socket is None:
+                self.output_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.output_socket.sendto(data, (target.hostname, target.port))
+        else:
+            if self.output_socket is None:
+                self.output_socket = socket.create_connection((target.hostname, target.port), timeout=2)
+            self.output_socket.sendall(data)
+
+    def close_socket(self):
+        if self.output_socket is not None:
+            try:
+                self.output_socket.close()
+            except:
+                pass
+            self.output_socket = None
+
+    def run(self):
+        """Run the telemetry loop on the calling thread until interrupted"""
+        try:
+            self.telemetry_loop()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.running = False
+            self.close_socket()
+            if self.is_connected:
+                self.ir.shutdown()
+
+def run_headless(argv):
+    """Entry point for --headless, no Tk window is ever created"""
+    parser = argparse.ArgumentParser(prog="LeagueOverlay",
+                                     description="Compute division standings without the overlay window")
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--output', default='-',
+                        help="'-' for JSON lines on stdout, tcp://host:port or udp://host:port for JSON "
+                             "lines over a socket, 'none' for no output, anything else is a file "
+                             "rewritten with the latest standings")
+    parser.add_argument('--league-config', help="league divisions file, defaults to the overlay's last one")
+    parser.add_argument('--refresh-rate', type=float, help="seconds between telemetry reads")
+    parser.add_argument('--smooth-gaps', action='store_true', help="smooth gaps against CarIdxEstTime noise")
+    parser.add_argument('--gap-trend', action='store_true', help="track closing/losing trends and laps to catch")
+    parser.add_argument('--points-file', help="points table and season totals for the championship projection")
+    parser.add_argument('--serve', type=int, metavar='PORT', help="also run the standings broadcast server")
+    parser.add_argument('--host', default='127.0.0.1', help="address for the broadcast server")
+    parser.add_argument('--test-file', help="read an SDK-layout file instead of the sim, see irsdk_emulator.py")
+    args = parser.parse_args(argv)
+
+    engine = HeadlessStandings(args.output, league_config=args.league_config)
+    engine.connection.test_file = args.test_file
+    if args.refresh_rate:
+        engine.refresh_rate = args.refresh_rate
+    if args.smooth_gaps:
+        engine.smooth_gaps = True
+    if args.gap_trend:
+        engine.track_gap_trend = True
+    if args.points_file:
+        engine.points.load(args.points_file)
+
+    server = None
+    if args.serve:
+        server = StandingsServer(engine, args.host, args.serve)
+        server.start()
+    try:
+        engine.run()
+    finally:
+        if server:
+            server.stop()
+    return 0
 
 class SettingsWindow:
     def __init__(self, parent_app):
@@ -1503,7 +3142,7 @@ class SettingsWindow:
         self.parent_app = parent_app
         self.window = tk.Toplevel(parent_app.root)
         self.window.title("BB's League Overlay - Settings")
-        self.window.geometry("290x590")
+        self.window.geometry("290x690")
         self.window.configure(bg='#2b2b2b')
         self.window.resizable(True, True)
         
@@ -1549,6 +3188,13 @@ class SettingsWindow:
             'hide_headers': self.parent_app.hide_headers,
             'center_drivers': self.parent_app.center_drivers,
             'bold_drivers': self.parent_app.bold_drivers,
+            'smooth_scroll': self.parent_app.smooth_scroll,
+            'adaptive_refresh': self.parent_app.adaptive_refresh,
+            'broadcast_enabled': self.parent_app.broadcast_enabled,
+            'show_points': self.parent_app.show_points,
+            'smooth_gaps': self.parent_app.smooth_gaps,
+            'trend_arrows': self.parent_app.trend_arrows,
+            'trend_colors': self.parent_app.trend_colors,
             'league_config': self.parent_app.color_config_file,
             'division_colors': self.parent_app.available_colors.copy()
         }
@@ -1620,6 +3266,12 @@ class SettingsWindow:
                                     bg='#2b2b2b', fg='white', highlightthickness=0)
         self.refresh_scale.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=(10, 0))
         
+        self.adaptive_refresh_var = tk.BooleanVar(value=self.parent_app.adaptive_refresh)
+        adaptive_check = tk.Checkbutton(window_frame, text="Adapt refresh to battles and cautions", 
+                                    variable=self.adaptive_refresh_var, bg='#2b2b2b', fg='white',
+                                    selectcolor='#404040', font=('Arial', 9))
+        adaptive_check.pack(anchor='w', padx=10)
+        
         # Window behavior settings
         behavior_frame = tk.Frame(window_frame, bg='#2b2b2b')
         behavior_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -1642,6 +3294,44 @@ class SettingsWindow:
                                     selectcolor='#404040', font=('Arial', 9))
         center_check.pack(anchor='w')
         
+        self.smooth_gaps_var = tk.BooleanVar(value=self.parent_app.smooth_gaps)
+        smooth_gaps_check = tk.Checkbutton(behavior_frame, text="Smooth gaps (less flicker)", 
+                                    variable=self.smooth_gaps_var, bg='#2b2b2b', fg='white',
+                                    selectcolor='#404040', font=('Arial', 9))
+        smooth_gaps_check.pack(anchor='w')
+        
+        self.trend_arrows_var = tk.BooleanVar(value=self.parent_app.trend_arrows)
+        trend_arrows_check = tk.Checkbutton(behavior_frame, text="Gap trend arrows (closing/losing)", 
+                                    variable=self.trend_arrows_var, bg='#2b2b2b', fg='white',
+                                    selectcolor='#404040', font=('Arial', 9))
+        trend_arrows_check.pack(anchor='w')
+        
+        self.trend_colors_var = tk.BooleanVar(value=self.parent_app.trend_colors)
+        trend_colors_check = tk.Checkbutton(behavior_frame, text="Color gaps by trend", 
+                                    variable=self.trend_colors_var, bg='#2b2b2b', fg='white',
+                                    selectcolor='#404040', font=('Arial', 9))
+        trend_colors_check.pack(anchor='w')
+        
+        self.smooth_scroll_var = tk.BooleanVar(value=self.parent_app.smooth_scroll)
+        smooth_check = tk.Checkbutton(behavior_frame, text="Smooth scroll to my position", 
+                                    variable=self.smooth_scroll_var, bg='#2b2b2b', fg='white',
+                                    selectcolor='#404040', font=('Arial', 9))
+        smooth_check.pack(anchor='w')
+        
+        self.broadcast_var = tk.BooleanVar(value=self.parent_app.broadcast_enabled)
+        broadcast_check = tk.Checkbutton(behavior_frame,
+                                    text=f"Broadcast standings on port {self.parent_app.broadcast_port}",
+                                    variable=self.broadcast_var, bg='#2b2b2b', fg='white',
+                                    selectcolor='#404040', font=('Arial', 9))
+        broadcast_check.pack(anchor='w')
+        
+        self.show_points_var = tk.BooleanVar(value=self.parent_app.show_points)
+        points_check = tk.Checkbutton(behavior_frame,
+                                    text=f"Show championship projection ({os.path.basename(self.parent_app.points_file)})",
+                                    variable=self.show_points_var, bg='#2b2b2b', fg='white',
+                                    selectcolor='#404040', font=('Arial', 9))
+        points_check.pack(anchor='w')
+        
         # === DIVISION COLORS SECTION ===
         colors_frame = tk.LabelFrame(scrollable_frame, text="Division Colors", 
                                    bg='#2b2b2b', fg='white', font=('Arial', 10, 'bold'))
@@ -1807,6 +3497,13 @@ class SettingsWindow:
             self.hide_headers_var.set(False)
             self.center_drivers_var.set(False)
             self.bold_drivers_var.set(False)
+            self.smooth_scroll_var.set(False)
+            self.smooth_gaps_var.set(False)
+            self.trend_arrows_var.set(False)
+            self.trend_colors_var.set(False)
+            self.adaptive_refresh_var.set(True)
+            self.broadcast_var.set(False)
+            self.show_points_var.set(False)
             
             # Reset division colors to defaults
             default_colors = {
@@ -1829,15 +3526,27 @@ class SettingsWindow:
         """Apply all settings and save to config"""
         try:
             # Update parent application settings
+            center_drivers_changed = self.parent_app.center_drivers != self.center_drivers_var.get()
             self.parent_app.opacity = self.opacity_var.get()
             self.parent_app.refresh_rate = self.refresh_rate_var.get()
+            self.parent_app.adaptive_refresh = self.adaptive_refresh_var.get()
             self.parent_app.hide_headers = self.hide_headers_var.get()
             self.parent_app.center_drivers = self.center_drivers_var.get()
             self.parent_app.bold_drivers = self.bold_drivers_var.get()
+            self.parent_app.smooth_scroll = self.smooth_scroll_var.get()
+            self.parent_app.auto_center.smooth = self.parent_app.smooth_scroll
+            self.parent_app.smooth_gaps = self.smooth_gaps_var.get()
+            self.parent_app.set_gap_trend(self.trend_arrows_var.get(), self.trend_colors_var.get())
+            self.parent_app.broadcast_enabled = self.broadcast_var.get()
+            self.parent_app.set_broadcast(self.parent_app.broadcast_enabled)
+            if self.show_points_var.get() != self.parent_app.show_points:
+                self.parent_app.set_show_points(self.show_points_var.get())
             
             # Update division colors
             for division, color_var in self.color_vars.items():
                 self.parent_app.available_colors[division] = color_var.get()
+            # Gap smoothing and division colors feed the standings, recompute them even while paused
+            self.parent_app.invalidate_frame()
             
             # Apply window changes
             self.parent_app.root.attributes('-alpha', self.parent_app.opacity)
@@ -1853,8 +3562,12 @@ class SettingsWindow:
                 if not self.parent_app.top_elements_visible:
                     self.parent_app.show_top_elements()
             
-            # Force layout refresh
-            self.parent_app.refresh_layout()
+            # Bold rows and division colors live in shared styles, rows follow them
+            self.parent_app.apply_styles()
+
+            # Name alignment is set per row, so only that needs a layout refresh
+            if center_drivers_changed:
+                self.parent_app.refresh_layout()
             
             # Save settings
             self.parent_app.save_settings()
@@ -1873,6 +3586,8 @@ class SettingsWindow:
         self.window.destroy()
 
 if __name__ == "__main__":
+    if '--headless' in sys.argv[1:]:
+        sys.exit(run_headless(sys.argv[1:]))
     try:
         app = leagueOverlay()
         app.run()
@@ -0,0 +1,287 @@
+"""Benchmarks for the telemetry and standings code paths, run with: python benchmarks.py"""
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import threading
+
+import irsdk
+
+from irsdk_emulator import SdkEmulator, SyntheticRace
+from LeagueOverlay import (MAX_CARS, GapFormatter, GapSmoother, HeadlessStandings, SessionStats, StandingsEngine,
+                           TelemetryReader)
+
+DIVISIONS = ["Pro", "ProAm", "Am", "Rookie"]
+
+
+class ScanningSessionStats(SessionStats):
+    """Session stats that rescan ResultsPositions on every read, like the overlay used to"""
+    def update(self, revision, current_session, drivers):
+        self.current_session = current_session
+        self.drivers = drivers
+        return super().update(revision, current_session, drivers)
+
+    def fastest_lap(self):
+        fastest_time = float('inf')
+        for driver in self.current_session['ResultsPositions']:
+            best_lap = driver['FastestTime']
+            if 0 < best_lap < fastest_time:
+                fastest_time = best_lap
+        return fastest_time if fastest_time != float('inf') else 90
+
+    def best_lap(self, car_idx):
+        for driver in self.current_session['ResultsPositions']:
+            if driver.get('CarIdx') == car_idx and 'FastestTime' in driver:
+                return driver['FastestTime']
+        return 90
+
+    def driver(self, car_idx):
+        for driver in self.drivers:
+            if driver.get('CarIdx') == car_idx:
+                return driver
+        return None
+
+
+def make_engine(race, session_stats=None):
+    """Standings engine reading from a synthetic race, drivers spread over the divisions"""
+    engine = StandingsEngine()
+    engine.ir = race
+    engine.is_connected = True
+    if session_stats is not None:
+        engine.session_stats = session_stats
+    engine.driver_colors = {
+        driver['UserName']: DIVISIONS[i % len(DIVISIONS)] for i, driver in enumerate(race.drivers)
+    }
+    return engine
+
+
+def time_ticks(engine, race, ticks, step=0.5):
+    """Average seconds per process_telemetry call"""
+    race.advance(step)
+    engine.process_telemetry()  # warm up caches
+    start = time.perf_counter()
+    for _ in range(ticks):
+        race.advance(step)
+        engine.process_telemetry()
+    return (time.perf_counter() - start) / ticks
+
+
+def report(name, seconds):
+    print(f"{name:<48} {seconds * 1e6:10.1f} us/tick")
+
+
+def bench_session_stats(ticks=300):
+    """Per-tick cost of session-level stats, scanning vs cached per revision"""
+    race = SyntheticRace()
+    drivers = race['DriverInfo']['Drivers']
+    current_session = race['SessionInfo']['Sessions'][0]
+    for label, stats in (("scanning", ScanningSessionStats()), ("cached", SessionStats())):
+        stats.update((race.session_info_update, 0), current_session, drivers)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            # What the race branch asks for per driver per tick
+            for car_idx in range(race.cars):
+                stats.driver(car_idx)
+                stats.fastest_lap()
+                stats.fastest_lap()
+                stats.best_lap(car_idx)
+        report(f"session stats lookups, {label}", (time.perf_counter() - start) / ticks)
+
+    for label, est_time in (("no CarIdxEstTime", False), ("with CarIdxEstTime", True)):
+        race = SyntheticRace(est_time=est_time)
+        report(f"process_telemetry, scanning ({label})",
+               time_ticks(make_engine(race, ScanningSessionStats()), race, ticks))
+        race = SyntheticRace(est_time=est_time)
+        report(f"process_telemetry, cached ({label})",
+               time_ticks(make_engine(race), race, ticks))
+
+
+def format_race_gap(time_gap, lap_difference):
+    """Gap text the way the overlay used to build it, an f-string every tick"""
+    if lap_difference > 0:
+        return f"{lap_difference}L"
+    if time_gap < 60:
+        return f"{time_gap:.1f}"
+    minutes = int(time_gap // 60)
+    seconds = time_gap % 60
+    return f"{minutes}:{seconds:04.1f}"
+
+
+def bench_gap_format(ticks=2000, cars=60):
+    """Gap text for a field of slowly drifting gaps, f-strings and string compares vs cached fixed-point keys"""
+    gaps = [(0.5 + car * 1.7, 1 if car % 15 == 14 else 0) for car in range(cars)]
+
+    previous = [''] * cars
+    start = time.perf_counter()
+    for tick in range(ticks):
+        for car, (gap, laps) in enumerate(gaps):
+            text = format_race_gap(gap + tick * 0.004, laps)
+            if text != previous[car]:
+                previous[car] = text
+    report("gap text, f-string per tick", (time.perf_counter() - start) / ticks)
+
+    formatter = GapFormatter()
+    previous_keys = [None] * cars
+    previous = [''] * cars
+    start = time.perf_counter()
+    for tick in range(ticks):
+        for car, (gap, laps) in enumerate(gaps):
+            key = GapFormatter.race_key(gap + tick * 0.004, laps)
+            if key != previous_keys[car]:
+                previous_keys[car] = key
+                previous[car] = formatter.text(key)
+    report("gap text, fixed-point key + cache", (time.perf_counter() - start) / ticks)
+
+
+def bench_gap_smoothing(seconds=600, cars=60, interval=0.25, noise=0.05):
+    """Label changes for slowly drifting gaps with CarIdxEstTime-like noise, raw vs smoothed"""
+    rng = random.Random(1)
+    drift = [rng.uniform(-0.01, 0.01) for _ in range(cars)]
+    smoother = GapSmoother()
+    raw_keys = [None] * cars
+    smooth_keys = [None] * cars
+    raw_changes = smooth_changes = 0
+    error = 0.0
+    samples = int(seconds / interval)
+    for sample in range(samples):
+        session_time = sample * interval
+        for car in range(cars):
+            true_gap = 2.0 + car * 0.3 + drift[car] * session_time
+            time_gap = max(0.0, true_gap + rng.gauss(0, noise))
+            key = GapFormatter.race_key(time_gap, 0)
+            raw_changes += key != raw_keys[car]
+            raw_keys[car] = key
+            key = smoother.key(car, car - 1, time_gap, session_time)
+            smooth_changes += key != smooth_keys[car]
+            smooth_keys[car] = key
+            error += abs(smoother.smoothed[car] - true_gap)
+    print(f"label changes per car per minute: raw {raw_changes / cars / seconds * 60:.1f}, "
+          f"smoothed {smooth_changes / cars / seconds * 60:.1f}, "
+          f"smoothed mean error {error / samples / cars:.3f}s (noise sd {noise}s, every {interval}s)")
+
+
+def bench_gap_trend(ticks=600):
+    """process_telemetry with and without the per-car gap trend windows"""
+    for label, track in (("trend off", False), ("trend on", True)):
+        race = SyntheticRace(est_time=True)
+        engine = make_engine(race)
+        engine.track_gap_trend = track
+        report(f"process_telemetry, {label}", time_ticks(engine, race, ticks))
+
+
+def bench_stale_frames(ticks=300):
+    """Loop running faster than the sim: each frame is read three times"""
+    race = SyntheticRace()
+    engine = make_engine(race)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        race.advance(0.5)
+        for _ in range(3):
+            engine.process_telemetry()
+    report("process_telemetry, 3 reads per frame", (time.perf_counter() - start) / (ticks * 3))
+    print(f"processed {engine.ticks_processed}, skipped {engine.ticks_skipped}")
+
+
+def bench_telemetry_reader(ticks=2000):
+    """Per-tick SDK reads of the race path, irsdk name lookups vs cached memoryviews"""
+    race = SyntheticRace()
+    race.advance(120.0)
+    path = os.path.join(tempfile.mkdtemp(), 'telemetry.bin')
+    SdkEmulator(path, race).close()
+    names = ['SessionNum', 'PlayerCarIdx', 'SessionTime', 'SessionTick', 'CarIdxLap', 'CarIdxLapDistPct',
+             'CarIdxClassPosition', 'CarIdxEstTime', 'CarIdxLastLapTime', 'CarIdxBestLapTime']
+
+    ir = irsdk.IRSDK()
+    ir.startup(test_file=path)
+    reader = TelemetryReader(irsdk.IRSDK())
+    reader.startup(test_file=path)
+    for label, source in (("irsdk", ir), ("TelemetryReader", reader)):
+        for touch_cars in (False, True):
+            start = time.perf_counter()
+            for _ in range(ticks):
+                source.freeze_var_buffer_latest()
+                for name in names:
+                    value = source[name]
+                    # Touch every car like the engine does
+                    if touch_cars and isinstance(value, (list, memoryview)):
+                        for car_idx in range(MAX_CARS):
+                            value[car_idx]
+            action = "reads + per-car access" if touch_cars else "reads"
+            report(f"SDK {action}, {label}", (time.perf_counter() - start) / ticks)
+    print(f"values match: {all(list(ir[name]) == list(reader[name]) if isinstance(ir[name], list) else ir[name] == reader[name] for name in names)}")
+    reader.shutdown()
+    ir.shutdown()
+    os.remove(path)
+
+
+def bench_allocations(ticks=1000):
+    """Transient memory and gen-0 collections per process_telemetry call, measured with tracemalloc"""
+    race = SyntheticRace(est_time=True)
+    engine = make_engine(race)
+    time_ticks(engine, race, 20)  # fill caches and row buffers first
+
+    gc.collect()
+    collections = gc.get_stats()[0]['collections']
+    tracemalloc.start()
+    transient = 0
+    for _ in range(ticks):
+        race.advance(0.5)
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        engine.process_telemetry()
+        transient += tracemalloc.get_traced_memory()[1] - baseline
+    collections = gc.get_stats()[0]['collections'] - collections
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"peak transient {transient / ticks / 1024:.2f} KiB/tick, {retained / 1024:.1f} KiB retained "
+          f"after {ticks} ticks, {collections} gen-0 collections")
+
+
+def bench_emulator(seconds=5.0):
+    """telemetry_loop end to end against the emulator writing at 60 Hz"""
+    path = os.path.join(tempfile.mkdtemp(), 'telemetry.bin')
+    race = SyntheticRace(est_time=True)
+    race.advance(120.0)
+    emulator = SdkEmulator(path, race)
+    writer = threading.Thread(target=emulator.run, args=(seconds + 1.0,))
+    writer.start()
+
+    engine = HeadlessStandings('none', settings_file=os.devnull)
+    engine.connection.test_file = path
+    engine.adaptive_refresh = False
+    engine.refresh_rate = 0.05
+    loop = threading.Thread(target=engine.telemetry_loop)
+    loop.start()
+    time.sleep(seconds)
+    engine.running = False
+    loop.join()
+    writer.join()
+    print(f"connection {engine.connection.state}, {engine.ticks_processed} ticks processed, "
+          f"{engine.ticks_skipped} skipped, {engine.standings_revision} snapshots, "
+          f"{len(engine.race_data)} cars in the last one")
+    engine.connection.drop(time.time())
+    emulator.close()
+    os.remove(path)
+
+
+BENCHMARKS = {
+    'session_stats': bench_session_stats,
+    'stale_frames': bench_stale_frames,
+    'gap_format': bench_gap_format,
+    'gap_smoothing': bench_gap_smoothing,
+    'gap_trend': bench_gap_trend,
+    'telemetry_reader': bench_telemetry_reader,
+    'allocations': bench_allocations,
+    'emulator': bench_emulator,
+}
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for name in selected:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
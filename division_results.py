@@ -0,0 +1,245 @@
+"""Division results for recorded sessions, run with:
+python division_results.py FILES... --league-config league_divisions.json [--csv out.csv] [--json out.json]
+
+Accepts .ibt telemetry files, replayed through the standings engine and
+classified by the session's official results, and the JSON-lines standings
+written by LeagueOverlay.py --headless, where the last snapshot is the final
+classification. Files are spread over a process pool.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ibt_replay import replay
+from LeagueOverlay import GAP_LEADER, GapFormatter, PointsEngine, StandingsEngine
+from season_store import SeasonStore
+
+CSV_FIELDS = ['file', 'division', 'division_position', 'position', 'car_number', 'driver_name', 'cust_id',
+              'interval', 'points', 'fastest_lap', 'average_lap', 'consistency', 'laps']
+
+
+def load_engine(league_config):
+    """Standings engine with the league's divisions loaded"""
+    engine = StandingsEngine()
+    if league_config:
+        engine.color_config_file = league_config
+        engine.driver_colors = engine.load_color_config()
+    return engine
+
+
+def race_laps(history, car_idx):
+    """Average and standard deviation of a car's valid laps over the whole session, None without laps"""
+    times = [lap_time for _, lap_time, valid in history.laps(car_idx) if valid]
+    if not times:
+        return None, None
+    average = sum(times) / len(times)
+    if len(times) < 2:
+        return average, None
+    return average, math.sqrt(sum((lap_time - average) ** 2 for lap_time in times) / len(times))
+
+
+def final_order(engine, session, class_positions):
+    """(CarIdx, official result) in class finishing order, from ResultsPositions or else CarIdxClassPosition"""
+    stats = engine.session_stats
+    player = stats.driver(engine.player_car_idx) or {}
+    class_id = player.get('CarClassID')
+
+    def in_class(car_idx):
+        driver = stats.driver(car_idx)
+        return driver is not None and (class_id is None or driver.get('CarClassID') == class_id)
+
+    results = [result for result in session.get('ResultsPositions') or []
+               if result.get('CarIdx') is not None and in_class(result['CarIdx'])]
+    if results:
+        results.sort(key=lambda result: result['Position'])
+        return [(result['CarIdx'], result) for result in results]
+
+    # No official results recorded, the last tick's class positions are the next best thing
+    cars = sorted((position, car_idx) for car_idx, position in enumerate(class_positions)
+                  if position > 0 and in_class(car_idx))
+    return [(car_idx, {}) for _, car_idx in cars]
+
+
+def interval(result, ahead, is_race):
+    """Interval to the division car ahead, formatted like the overlay's gap column"""
+    if ahead is None:
+        return GapFormatter.format(GAP_LEADER)
+    if is_race:
+        lap_difference = ahead.get('LapsComplete', 0) - result.get('LapsComplete', 0)
+        time_gap = result.get('Time', 0) - ahead.get('Time', 0)
+        if lap_difference <= 0 and (result.get('Time', 0) <= 0 or ahead.get('Time', 0) <= 0):
+            return None
+        return GapFormatter.format(GapFormatter.race_key(time_gap, lap_difference))
+    if result.get('FastestTime', 0) <= 0 or ahead.get('FastestTime', 0) <= 0:
+        return None
+    return GapFormatter.format(GapFormatter.best_lap_key(result['FastestTime'] - ahead['FastestTime']))
+
+
+def ibt_results(path, league_config, every):
+    """Final division classification of an .ibt file, from the session's official results"""
+    final = {}
+
+    def keep_session(engine, source):
+        # The file is closed once the replay ends, keep what the classification needs
+        final['session_num'] = source['SessionNum']
+        final['sessions'] = source['SessionInfo']['Sessions']
+        final['class_positions'] = list(source['CarIdxClassPosition'] or [])
+
+    engine = replay(path, every=every, engine=load_engine(league_config), on_tick=keep_session)
+    if not final:
+        return []
+    session = final['sessions'][final['session_num']]
+    is_race = (session.get('SessionType') or '').lower() == 'race'
+    order = final_order(engine, session, final['class_positions'])
+
+    results = []
+    division_ahead = {}
+    division_counts = {}
+    for position, (car_idx, result) in enumerate(order, 1):
+        driver = engine.session_stats.driver(car_idx)
+        driver_name = driver.get('UserName', '')
+        division = engine.get_driver_division(driver_name)
+        ahead = division_ahead.get(division)
+        division_ahead[division] = result
+        division_counts[division] = division_counts.get(division, 0) + 1
+        fastest_lap = result.get('FastestTime') or 0
+        if fastest_lap <= 0:
+            fastest_lap = engine.lap_history.best_lap(car_idx)
+        average_lap, consistency = race_laps(engine.lap_history, car_idx)
+        results.append({
+            'division': division,
+            'division_position': division_counts[division],
+            'position': position,
+            'car_number': driver.get('CarNumber', ''),
+            'driver_name': driver_name,
+            'cust_id': driver.get('UserID'),
+            'interval': interval(result, ahead, is_race) if 'Position' in result else None,
+            'fastest_lap': round(fastest_lap, 3) if fastest_lap > 0 else None,
+            'average_lap': round(average_lap, 3) if average_lap else None,
+            'consistency': round(consistency, 3) if consistency is not None else None,
+            'laps': result.get('LapsComplete', engine.lap_history.lap_count[car_idx]),
+        })
+    return results
+
+
+def jsonl_results(path):
+    """Final division classification from the last snapshot of a headless recording"""
+    last_line = None
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                last_line = line
+    if last_line is None:
+        return []
+    return [{
+        'division': row['division'],
+        'division_position': row['division_position'],
+        'position': row['position'],
+        'car_number': row['car_number'],
+        'driver_name': row['driver_name'],
+        'cust_id': row.get('cust_id'),  # Missing from recordings made before it was written
+        'interval': row['gap'],
+        'fastest_lap': None,
+        'average_lap': None,
+        'consistency': None,
+        'laps': None,
+    } for row in json.loads(last_line)['rows']]
+
+
+def session_results(path, league_config=None, every=1.0, points_file=None):
+    """Results for one recorded session, grouped by division. Runs in a pool worker"""
+    started = time.perf_counter()
+    if path.lower().endswith('.ibt'):
+        results = ibt_results(path, league_config, every)
+    else:
+        results = jsonl_results(path)
+
+    # Points scored by division finishing position
+    points = PointsEngine()
+    points.load(points_file)
+    for result in results:
+        result['points'] = points.finishing_points(result['division_position'])
+
+    divisions = {}
+    for result in results:
+        divisions.setdefault(result['division'], []).append(result)
+    for rows in divisions.values():
+        rows.sort(key=lambda result: result['division_position'])
+    return {'file': os.path.basename(path), 'divisions': divisions, 'seconds': time.perf_counter() - started}
+
+
+def write_csv(sessions, output):
+    writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for session in sessions:
+        for division, rows in session['divisions'].items():
+            for row in rows:
+                writer.writerow(dict(row, file=session['file'], division=division))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Division results for recorded league sessions")
+    parser.add_argument('files', nargs='+', help=".ibt files or headless JSON-lines recordings")
+    parser.add_argument('--league-config', help="league divisions file")
+    parser.add_argument('--every', type=float, default=1.0, help="session seconds between engine ticks for .ibt")
+    parser.add_argument('--points-file', help="points table, the same file as the overlay's projection")
+    parser.add_argument('--jobs', type=int, help="worker processes, defaults to the CPU count")
+    parser.add_argument('--csv', help="CSV output file, '-' for stdout")
+    parser.add_argument('--json', help="JSON output file, '-' for stdout")
+    parser.add_argument('--store', help="season store database to record the results in")
+    parser.add_argument('--season', default='1', help="season the files belong to, in round order")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    sessions = []
+    rounds = []
+    errors = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(session_results, path, args.league_config, args.every, args.points_file) for path in args.files]
+        for round_number, (path, future) in enumerate(zip(args.files, futures), 1):
+            try:
+                sessions.append(future.result())
+                rounds.append(round_number)
+            except Exception as e:
+                errors += 1
+                print(f"Results error in {path}: {e}", file=sys.stderr)
+
+    # Opened once the pool is done, the store's writer thread must not be running when workers fork
+    if args.store:
+        store = SeasonStore(args.store)
+        for round_number, session in zip(rounds, sessions):
+            rows = [row for rows in session['divisions'].values() for row in rows]
+            try:
+                store.record_race(args.season, round_number, session['file'], rows)
+            except ValueError as e:
+                errors += 1
+                print(f"Season store error: {e}", file=sys.stderr)
+        store.close()
+        errors += store.write_errors
+
+    if args.json:
+        data = {session['file']: session['divisions'] for session in sessions}
+        if args.json == '-':
+            json.dump(data, sys.stdout, indent=2)
+        else:
+            with open(args.json, 'w') as f:
+                json.dump(data, f, indent=2)
+    if args.csv or not args.json:
+        if not args.csv or args.csv == '-':
+            write_csv(sessions, sys.stdout)
+        else:
+            with open(args.csv, 'w', newline='') as f:
+                write_csv(sessions, f)
+
+    print(f"{len(sessions)} of {len(args.files)} sessions in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
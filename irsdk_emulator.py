@@ -0,0 +1,212 @@
+"""iRacing shared memory emulator for developing and benchmarking without the sim
+
+Writes a scripted race into a file laid out like the SDK memory map: header,
+var headers, session info string and rotating telemetry buffers, advanced at
+60 Hz. Point the overlay at it with: python LeagueOverlay.py --headless --test-file PATH
+"""
+import argparse
+import mmap
+import random
+import struct
+import time
+
+import irsdk
+import yaml
+
+from LeagueOverlay import MAX_CARS
+
+HEADER_SIZE = 112  # Header fields plus four rotating buffer descriptors
+VAR_HEADER_SIZE = 144
+SESSION_INFO_MIN_SIZE = 64 * 1024  # Room reserved for the session string, it is rewritten in place
+
+# (name, irsdk var type, count) written to the telemetry buffers
+SDK_VARS = [
+    ('SessionNum', 2, 1), ('SessionTime', 5, 1), ('SessionTick', 2, 1), ('PlayerCarIdx', 2, 1),
+    ('CarIdxLap', 2, MAX_CARS), ('CarIdxLapDistPct', 4, MAX_CARS), ('CarIdxClassPosition', 2, MAX_CARS),
+    ('CarIdxEstTime', 4, MAX_CARS), ('CarIdxLastLapTime', 4, MAX_CARS), ('CarIdxBestLapTime', 4, MAX_CARS),
+]
+
+
+class SyntheticRace:
+    """Scripted race that answers the same keys as irsdk.IRSDK"""
+    def __init__(self, cars=60, lap_time=90.0, est_time=False, session_type="Race", seed=1):
+        rng = random.Random(seed)
+        self.cars = cars
+        self.est_time = est_time
+        self.session_time = 0.0
+        self.session_info_update = 1
+        self.is_connected = True
+        self.is_initialized = True
+        self.values = {}
+
+        # Each car runs a steady pace with a small head start
+        self.paces = [lap_time * (1 + rng.uniform(0.0, 0.04)) for _ in range(cars)]
+        self.offsets = [rng.uniform(0.0, 0.2) for _ in range(cars)]
+
+        self.drivers = [{
+            'CarIdx': car_idx,
+            'UserName': f"Driver {car_idx + 1}",
+            'UserID': 100000 + car_idx,
+            'CarNumber': str(car_idx + 1),
+            'CarClassID': 1,
+        } for car_idx in range(cars)]
+        self.session_info = {'Sessions': [{
+            'SessionType': session_type,
+            'ResultsPositions': [{
+                'CarIdx': car_idx,
+                'Position': car_idx + 1,
+                'FastestTime': self.paces[car_idx],
+            } for car_idx in range(cars)],
+        }]}
+        self.advance(0.0)
+
+    def advance(self, seconds):
+        """Move the race clock forward and build the arrays for the new tick"""
+        self.session_time += seconds
+        cars = self.cars
+        empty = MAX_CARS - cars
+        progress = [self.offsets[i] + self.session_time / self.paces[i] for i in range(cars)]
+
+        order = sorted(range(cars), key=progress.__getitem__, reverse=True)
+        positions = [0] * MAX_CARS
+        for position, car_idx in enumerate(order):
+            positions[car_idx] = position + 1
+
+        lap_times = [self.paces[i] if progress[i] >= 1 else -1.0 for i in range(cars)] + [-1.0] * empty
+        if self.est_time:
+            est_times = [(progress[i] % 1.0) * self.paces[i] for i in range(cars)] + [0.0] * empty
+        else:
+            est_times = [0.0] * MAX_CARS
+
+        self.values = {
+            'DriverInfo': {'Drivers': self.drivers},
+            'SessionInfo': self.session_info,
+            'SessionNum': 0,
+            'PlayerCarIdx': 0,
+            'SessionTime': self.session_time,
+            'SessionTick': int(self.session_time * 60),
+            'CarIdxLap': [int(p) for p in progress] + [-1] * empty,
+            'CarIdxLapDistPct': [p % 1.0 for p in progress] + [-1.0] * empty,
+            'CarIdxClassPosition': positions,
+            'CarIdxEstTime': est_times,
+            'CarIdxLastLapTime': lap_times,
+            'CarIdxBestLapTime': lap_times,
+        }
+
+    def __getitem__(self, key):
+        return self.values.get(key)
+
+
+class SdkEmulator:
+    """File-backed memory map in the iRacing SDK layout, fed one tick at a time from a race"""
+    def __init__(self, path, race, variables=SDK_VARS, buffers=3, tick_rate=60):
+        self.race = race
+        self.buffers = buffers
+        self.tick_rate = tick_rate
+        self.tick_count = 0
+        self.session_info_update = None
+
+        # Every variable packed back to back in one buffer line
+        self.line = struct.Struct('<' + ''.join(irsdk.VAR_TYPE_MAP[var_type] * count
+                                                for _, var_type, count in variables))
+        self.variables = variables
+        var_header_offset = HEADER_SIZE
+        self.session_offset = var_header_offset + len(variables) * VAR_HEADER_SIZE
+        self.session_size = max(SESSION_INFO_MIN_SIZE, 2 * len(self.session_info()))
+        buf_offset = self.session_offset + self.session_size
+        self.buf_offsets = [buf_offset + i * self.line.size for i in range(buffers)]
+
+        size = buf_offset + buffers * self.line.size
+        with open(path, 'wb') as f:
+            f.truncate(size)
+        self.file = open(path, 'r+b')
+        self.memory = mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_WRITE)
+
+        struct.pack_into('<10i', self.memory, 0,
+                         2,  # version
+                         irsdk.StatusField.status_connected, tick_rate,
+                         0, 0, self.session_offset,  # session info update, length, offset
+                         len(variables), var_header_offset, buffers, self.line.size)
+        offset = 0
+        for i, (name, var_type, count) in enumerate(variables):
+            struct.pack_into('<iii?3x32s64s32s', self.memory, var_header_offset + i * VAR_HEADER_SIZE,
+                             var_type, offset, count, False, name.encode(), b'', b'')
+            offset += struct.calcsize(irsdk.VAR_TYPE_MAP[var_type]) * count
+        for i in range(buffers):
+            struct.pack_into('<ii', self.memory, 48 + i * 16, 0, self.buf_offsets[i])
+        # Fill every buffer so readers never see an empty one
+        for _ in range(buffers):
+            self.write_tick()
+
+    def session_info(self):
+        """Session string in iRacing's format, one YAML section per key ending in a blank line"""
+        sections = "".join(yaml.safe_dump({key: self.race[key]}, default_flow_style=False, sort_keys=False) + "\n"
+                           for key in ('SessionInfo', 'DriverInfo'))
+        return ("---\n" + sections + "...\n").encode('utf-8')
+
+    def write_session_info(self):
+        data = self.session_info()[:self.session_size]
+        self.memory[self.session_offset:self.session_offset + len(data)] = data
+        self.memory[self.session_offset + len(data):self.session_offset + self.session_size] = \
+            bytes(self.session_size - len(data))
+        struct.pack_into('<ii', self.memory, 12, self.race.session_info_update, len(data))
+        self.session_info_update = self.race.session_info_update
+
+    def write_tick(self):
+        """Write the race's current values into the next rotating buffer"""
+        if self.race.session_info_update != self.session_info_update:
+            self.write_session_info()
+
+        values = []
+        for name, _, count in self.variables:
+            value = self.race[name]
+            if count == 1:
+                values.append(value)
+            else:
+                values.extend(value)
+        self.tick_count += 1
+        i = self.tick_count % self.buffers
+        descriptor = 48 + i * 16
+        # Tick count only once the line is complete, readers pick the buffer by it
+        self.line.pack_into(self.memory, self.buf_offsets[i], *values)
+        struct.pack_into('<i', self.memory, descriptor, self.tick_count)
+
+    def run(self, duration=None, speed=1.0):
+        """Advance the race at tick_rate in real time until duration seconds have passed"""
+        interval = 1.0 / self.tick_rate
+        start = time.perf_counter()
+        next_tick = start
+        while duration is None or time.perf_counter() - start < duration:
+            self.race.advance(interval * speed)
+            self.write_tick()
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # Fell behind, don't try to catch up in a burst
+
+    def close(self):
+        self.memory.close()
+        self.file.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic race in the iRacing shared memory layout")
+    parser.add_argument('--path', default='iracing_emulator.bin', help="file the overlay reads with --test-file")
+    parser.add_argument('--cars', type=int, default=60)
+    parser.add_argument('--lap-time', type=float, default=90.0)
+    parser.add_argument('--session-type', default="Race")
+    parser.add_argument('--duration', type=float, help="seconds to run, forever if not given")
+    parser.add_argument('--speed', type=float, default=1.0, help="race seconds per real second")
+    args = parser.parse_args()
+
+    emulator = SdkEmulator(args.path, SyntheticRace(args.cars, args.lap_time, est_time=True,
+                                                    session_type=args.session_type))
+    print(f"Writing {args.cars} cars to {args.path} at {emulator.tick_rate} Hz")
+    try:
+        emulator.run(args.duration, args.speed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.close()
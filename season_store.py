@@ -0,0 +1,211 @@
+"""Season results stored in SQLite, run with:
+python season_store.py DB season SEASON [--division NAME]
+python season_store.py DB driver CUST_ID [--season SEASON]
+python season_store.py DB head-to-head CUST_ID CUST_ID [--season SEASON]
+
+Results are written by a background thread in batched transactions, so the
+caller never waits on the disk. Queries read through their own connection.
+"""
+import argparse
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+BATCH_SIZE = 64  # Races per transaction at most
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    race_id INTEGER PRIMARY KEY,
+    season TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    recorded REAL NOT NULL,
+    UNIQUE (season, name)
+);
+CREATE TABLE IF NOT EXISTS results (
+    race_id INTEGER NOT NULL REFERENCES races (race_id) ON DELETE CASCADE,
+    cust_id INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    division TEXT NOT NULL,
+    division_position INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    car_number TEXT,
+    driver_name TEXT,
+    interval TEXT,
+    points REAL NOT NULL DEFAULT 0,
+    laps INTEGER,
+    fastest_lap REAL,
+    average_lap REAL,
+    consistency REAL,
+    PRIMARY KEY (race_id, cust_id)
+) WITHOUT ROWID;
+-- Driver's season
+CREATE INDEX IF NOT EXISTS results_driver ON results (cust_id, season, race_id);
+-- Division points table, covering so the totals never touch the table
+CREATE INDEX IF NOT EXISTS results_division ON results (season, division, cust_id, points, division_position);
+"""
+
+
+class SeasonStore:
+    """Per-race division results and lap summaries keyed by CustID and division"""
+    def __init__(self, path):
+        self.path = path
+        self.pending = queue.Queue()
+        self.write_errors = 0  # Races lost to failed transactions
+        self.connection = self.connect()
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        # WAL lets queries run while the writer commits
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    def record_race(self, season, round_number, name, rows):
+        """Queue a race's results, rows as from division_results; replaces a race of the same name"""
+        rows = list(rows)
+        # Results are keyed by CustID, a race without them would be stored empty
+        missing = [row.get('driver_name') or '?' for row in rows if row.get('cust_id') is None]
+        if missing:
+            raise ValueError(f"{name}: no CustID for {', '.join(missing)}")
+        self.pending.put((str(season), round_number, name, time.time(), rows))
+
+    def flush(self):
+        """Block until everything queued so far is committed"""
+        self.pending.join()
+
+    def close(self):
+        self.pending.put(None)
+        self.writer.join()
+        self.connection.close()
+
+    def write_loop(self):
+        """Background writer, drains the queue into one transaction per batch"""
+        connection = self.connect()
+        running = True
+        while running:
+            batch = [self.pending.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            running = None not in batch
+            try:
+                with connection:
+                    for race in batch:
+                        if race is not None:
+                            self.write_race(connection, *race)
+            except Exception as e:
+                # The whole batch rolled back
+                self.write_errors += sum(race is not None for race in batch)
+                print(f"Season store write error: {e}", file=sys.stderr)
+            for _ in batch:
+                self.pending.task_done()
+        connection.close()
+
+    def write_race(self, connection, season, round_number, name, recorded, rows):
+        connection.execute("DELETE FROM races WHERE season = ? AND name = ?", (season, name))
+        race_id = connection.execute(
+            "INSERT INTO races (season, round, name, recorded) VALUES (?, ?, ?, ?)",
+            (season, round_number, name, recorded)).lastrowid
+        connection.executemany(
+            "INSERT OR REPLACE INTO results VALUES "
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(race_id, row['cust_id'], season, row['division'], row['division_position'], row['position'],
+              row.get('car_number'), row.get('driver_name'), row.get('interval'), row.get('points') or 0,
+              row.get('laps'), row.get('fastest_lap'), row.get('average_lap'), row.get('consistency'))
+             for row in rows])
+
+    def driver_season(self, cust_id, season=None):
+        """A driver's results race by race, every season unless one is given"""
+        query = ("SELECT races.season, races.round, races.name, results.* FROM results "
+                 "JOIN races USING (race_id) WHERE results.cust_id = ?")
+        params = [cust_id]
+        if season is not None:
+            query += " AND results.season = ?"
+            params.append(str(season))
+        return self.connection.execute(query + " ORDER BY races.season, races.round", params).fetchall()
+
+    def division_points(self, season, division=None):
+        """Championship table per division, best total first"""
+        query = ("SELECT division, cust_id, SUM(points) AS points, COUNT(*) AS races, "
+                 "SUM(division_position = 1) AS wins FROM results WHERE season = ?")
+        params = [str(season)]
+        if division is not None:
+            query += " AND division = ?"
+            params.append(division)
+        query += " GROUP BY division, cust_id ORDER BY division, points DESC, wins DESC"
+        rows = self.connection.execute(query, params).fetchall()
+        names = self.driver_names([row['cust_id'] for row in rows], season)
+        return [dict(row, driver_name=names.get(row['cust_id'])) for row in rows]
+
+    def head_to_head(self, cust_id, other_cust_id, season=None):
+        """Races both drivers finished, with each one's division and overall position"""
+        query = ("SELECT races.season, races.round, races.name, a.division AS division, "
+                 "a.position AS position, b.division AS other_division, b.position AS other_position "
+                 "FROM results a JOIN results b ON b.race_id = a.race_id AND b.cust_id = ? "
+                 "JOIN races ON races.race_id = a.race_id WHERE a.cust_id = ?")
+        params = [other_cust_id, cust_id]
+        if season is not None:
+            query += " AND a.season = ?"
+            params.append(str(season))
+        return self.connection.execute(query + " ORDER BY races.season, races.round", params).fetchall()
+
+    def driver_names(self, cust_ids, season):
+        """Latest name each CustID raced under in a season"""
+        cust_ids = list(set(cust_ids))
+        placeholders = ', '.join('?' * len(cust_ids))
+        rows = self.connection.execute(
+            f"SELECT cust_id, driver_name FROM results WHERE cust_id IN ({placeholders}) AND season = ? "
+            "ORDER BY race_id", cust_ids + [str(season)])
+        # Later races overwrite earlier ones
+        return {row['cust_id']: row['driver_name'] for row in rows}
+
+
+def print_rows(rows):
+    rows = [dict(row) for row in rows]
+    if not rows:
+        print("no results")
+        return
+    columns = list(rows[0])
+    print('\t'.join(columns))
+    for row in rows:
+        print('\t'.join('' if row[column] is None else str(row[column]) for column in columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the league season store")
+    parser.add_argument('db')
+    commands = parser.add_subparsers(dest='command', required=True)
+    season_parser = commands.add_parser('season', help="division points table")
+    season_parser.add_argument('season')
+    season_parser.add_argument('--division')
+    driver_parser = commands.add_parser('driver', help="a driver's season")
+    driver_parser.add_argument('cust_id', type=int)
+    driver_parser.add_argument('--season')
+    versus_parser = commands.add_parser('head-to-head', help="two drivers in the same races")
+    versus_parser.add_argument('cust_id', type=int)
+    versus_parser.add_argument('other_cust_id', type=int)
+    versus_parser.add_argument('--season')
+    args = parser.parse_args()
+
+    store = SeasonStore(args.db)
+    started = time.perf_counter()
+    if args.command == 'season':
+        rows = store.division_points(args.season, args.division)
+    elif args.command == 'driver':
+        rows = store.driver_season(args.cust_id, args.season)
+    else:
+        rows = store.head_to_head(args.cust_id, args.other_cust_id, args.season)
+    elapsed = time.perf_counter() - started
+    print_rows(rows)
+    print(f"{len(rows)} rows in {elapsed * 1000:.1f} ms")
+    store.close()
@@ -0,0 +1,224 @@
+"""Local HTTP server that broadcasts the standings to browser sources and second screens"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8765
+KEEPALIVE_SECONDS = 15.0  # Comment line sent to idle clients so proxies keep the stream open
+
+
+class StandingsBroadcaster:
+    """Latest standings snapshot shared by any number of subscribers
+
+    The telemetry thread only encodes the rows into plain lists, each
+    subscriber serializes and sends on its own thread. A subscriber that falls
+    behind wakes up to the newest snapshot and gets it in full, the snapshots
+    in between are dropped.
+    """
+    RECOLORED = ('color',)  # Change set entry for a car whose division color changed
+
+    def __init__(self, color_for=None):
+        self.color_for = color_for or (lambda driver_name: '#FFFFFF')
+        self.condition = threading.Condition()
+        self.snapshot = (0, [], {})
+        self.colors = {}  # car_idx -> color last published, colors are not part of the engine's changes
+        self.previous_revision = None  # Revision the snapshot's change set applies to
+        self.encoded_full = (None, b'')
+        self.encoded_delta = (None, b'')
+        self.closed = False
+
+    def publish(self, snapshot):
+        """Take a (revision, rows, changes) snapshot, never blocks on subscribers"""
+        # The engine reuses its row objects, so they are copied out while still current
+        revision, rows, changes = snapshot
+        encoded = [self.encode_row(row) for row in rows]
+
+        # Division colors can change in Settings without any row changing
+        colors = self.colors
+        recolored = [row[0] for row in encoded if colors.get(row[0]) != row[7] and row[0] not in changes]
+        if recolored:
+            changes = dict(changes)
+            for car_idx in recolored:
+                changes[car_idx] = self.RECOLORED
+        self.colors = {row[0]: row[7] for row in encoded}
+        with self.condition:
+            self.previous_revision = self.snapshot[0]
+            self.snapshot = (revision, encoded, changes)
+            self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def wait(self, last_revision, timeout=KEEPALIVE_SECONDS):
+        """Block until there is a snapshot newer than last_revision, or the timeout passes"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.closed or self.snapshot[0] != last_revision, timeout)
+            return self.snapshot, self.previous_revision
+
+    def encode_row(self, row):
+        return [row['car_idx'], row['position'], row['division_position'], row['car_number'],
+                row['driver_name'], row['gap'], 1 if row['is_player'] else 0,
+                self.color_for(row['driver_name'])]
+
+    def message(self, snapshot, previous_revision, last_revision):
+        """Encoded event for a client that has seen last_revision, a delta when it is one behind"""
+        revision, rows, changes = snapshot
+        delta = last_revision is not None and previous_revision == last_revision
+        cached_revision, data = self.encoded_delta if delta else self.encoded_full
+        if cached_revision == revision:
+            return data
+
+        # Clients drop any car missing from the order, so removals need no entry of their own
+        message = {'v': revision, 'order': [row[0] for row in rows]}
+        if delta:
+            message['rows'] = [row for row in rows if row[0] in changes]
+        else:
+            message['full'] = 1
+            message['rows'] = rows
+        data = f"data: {json.dumps(message, separators=(',', ':'))}\n\n".encode('utf-8')
+
+        # Shared by every client on the same step, a lost race only costs a second encode
+        if delta:
+            self.encoded_delta = (revision, data)
+        else:
+            self.encoded_full = (revision, data)
+        return data
+
+
+class StandingsRequestHandler(BaseHTTPRequestHandler):
+    """Serves the page, a JSON snapshot and the event stream"""
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/':
+            self.send_body(PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+        elif path == '/standings.json':
+            broadcaster = self.server.broadcaster
+            revision, rows, _ = broadcaster.snapshot
+            body = json.dumps({'v': revision, 'rows': rows})
+            self.send_body(body.encode('utf-8'), 'application/json')
+        elif path == '/events':
+            self.stream_events()
+        else:
+            self.send_error(404)
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_events(self):
+        """Server-sent events, one message per snapshot this client gets to see"""
+        broadcaster = self.server.broadcaster
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        # A client that stops reading eventually times out instead of holding a thread forever
+        self.connection.settimeout(10)
+
+        last_revision = None
+        try:
+            while not broadcaster.closed:
+                snapshot, previous_revision = broadcaster.wait(last_revision)
+                if snapshot[0] == last_revision:
+                    self.wfile.write(b': keepalive\n\n')
+                else:
+                    self.wfile.write(broadcaster.message(snapshot, previous_revision, last_revision))
+                    last_revision = snapshot[0]
+                self.wfile.flush()
+        except OSError:
+            pass  # Client went away
+
+    def log_message(self, format, *args):
+        pass  # Keep the console for errors
+
+
+class StandingsServer:
+    """Optional broadcast server fed from a StandingsEngine"""
+    def __init__(self, engine, host='127.0.0.1', port=DEFAULT_PORT):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.broadcaster = StandingsBroadcaster(engine.get_driver_color)
+        self.httpd = None
+
+    def start(self):
+        """Start serving on a background thread and subscribe to the engine"""
+        self.httpd = ThreadingHTTPServer((self.host, self.port), StandingsRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.broadcaster = self.broadcaster
+        # Hold the snapshot so the telemetry thread can't reuse its rows while they are encoded
+        snapshot = self.engine.acquire_standings()
+        try:
+            self.broadcaster.publish(snapshot)
+        finally:
+            self.engine.release_standings()
+        self.engine.standings_listeners.append(self.broadcaster.publish)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self.httpd is None:
+            return
+        if self.broadcaster.publish in self.engine.standings_listeners:
+            self.engine.standings_listeners.remove(self.broadcaster.publish)
+        self.broadcaster.close()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.httpd = None
+
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>League Standings</title>
+<style>
+  body { margin: 0; background: transparent; font: bold 14px Arial, sans-serif; color: #fff; }
+  table { border-collapse: collapse; width: 100%; background: rgba(0, 0, 0, 0.8); }
+  th { background: #333; text-align: left; padding: 2px 6px; }
+  td { padding: 2px 6px; white-space: nowrap; }
+  tr.player td { background: #1a1a1a; }
+</style>
+</head>
+<body>
+<table>
+  <thead><tr><th>Pos</th><th>D-Pos</th><th>Car#</th><th>Driver</th><th>Div Gap</th></tr></thead>
+  <tbody id="rows"></tbody>
+</table>
+<script>
+  const rows = new Map();  // car_idx -> [car_idx, pos, div_pos, car_number, name, gap, is_player, color]
+  const body = document.getElementById('rows');
+
+  function render(order) {
+    const html = [];
+    for (const carIdx of order) {
+      const row = rows.get(carIdx);
+      if (!row) continue;
+      const cells = row.slice(1, 6).map(function (value, i) {
+        const text = String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;');
+        return i < 4 ? '<td style="color:' + row[7] + '">' + text + '</td>' : '<td>' + text + '</td>';
+      });
+      html.push('<tr' + (row[6] ? ' class="player"' : '') + '>' + cells.join('') + '</tr>');
+    }
+    body.innerHTML = html.join('');
+  }
+
+  const events = new EventSource('/events');
+  events.onmessage = function (event) {
+    const message = JSON.parse(event.data);
+    if (message.full) rows.clear();
+    for (const row of message.rows) rows.set(row[0], row);
+    const present = new Set(message.order);
+    for (const carIdx of rows.keys()) if (!present.has(carIdx)) rows.delete(carIdx);
+    render(message.order);
+  };
+</script>
+</body>
+</html>
+"""